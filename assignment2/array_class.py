@@ -2,12 +2,406 @@
 Array class for assignment 2
 """
 
-import itertools as iter
-import copy
+import array
+import functools
+import itertools
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
+
+# Buffer format character and Python element type of every supported dtype
+_DTYPES = {
+    "bool": ("?", bool),
+    "int8": ("b", int),
+    "int16": ("h", int),
+    "int32": ("i", int),
+    "int64": ("q", int),
+    "float32": ("f", float),
+    "float64": ("d", float),
+}
+
+# Number of bytes of one element of every dtype
+_ITEMSIZES = {
+    dtype: struct.calcsize(typecode) for dtype, (typecode, _) in _DTYPES.items()
+}
+
+# dtype used for elements of each Python type if no dtype is given
+_DEFAULT_DTYPES = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+}
+
+# numpy array interface type kind of the elements of each Python type
+_TYPESTR_KINDS = {
+    bool: "b",
+    int: "i",
+    float: "f",
+}
+
+# Python operator of every operation LazyArray expressions are built from
+_OPERATOR_SYMBOLS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+}
+
+# Number of elements written at a time when filling contiguous arrays
+_BLOCK_SIZE = 65536
+
+# Number of rows and columns in the tiles of a matrix multiplication
+_MATMUL_BLOCK = 64
+
+# Arrays with at least this many elements are computed on a process pool, see `set_parallel`.
+# None computes all arrays in this process.
+_PARALLEL_THRESHOLD = None
+
+# Number of worker processes of parallel computations
+_PARALLEL_WORKERS = os.cpu_count()
+
+# Byte order of the elements in memory, as used in numpy type strings
+_BYTEORDER = "<" if sys.byteorder == "little" else ">"
+
+# mmap access of every mode of a memory-mapped array
+_MMAP_ACCESS = {
+    "r": mmap.ACCESS_READ,
+    "r+": mmap.ACCESS_WRITE,
+    "w+": mmap.ACCESS_WRITE,
+    "c": mmap.ACCESS_COPY,
+}
+
+# Header of files written by `Array.save`: magic bytes, format version, byte order, dtype name and
+# number of dimensions, followed by the shape as unsigned 64-bit integers
+_FILE_HEADER = struct.Struct("<6sBc8sB")
+_FILE_MAGIC = b"\x93ARRAY"
+_FILE_VERSION = 1
+
+# The elements of a saved array start at a multiple of this many bytes, so they can be memory-mapped aligned
+_FILE_ALIGNMENT = 64
+
+
+def _make_buffer(dtype, values):
+    """Returns a flat memoryview over a newly allocated typed buffer.
+
+    Args:
+        dtype (str): dtype of the buffer, a key of `_DTYPES`.
+        values (iterable): The values to store in the buffer.
+
+    Returns:
+        memoryview: One-dimensional buffer with the format of `dtype`.
+
+    Raises:
+        TypeError: If a value can not be stored with the dtype, i.e. a float in an integer buffer.
+        OverflowError: If an integer is out of the range of the dtype.
+    """
+    typecode, datatype = _DTYPES[dtype]
+    if datatype == bool:
+        # array.array has no boolean type, so we store bytes and view them as booleans
+        return memoryview(array.array("B", map(bool, values))).cast("?")
+    return memoryview(array.array(typecode, values))
+
+
+def _dtype_name(dtype):
+    """Returns the name of a dtype given by its name or by a Python type.
+
+    Args:
+        dtype (str, type): Name of the dtype, e.g. "int8", or bool, int or float for their default dtype.
+            Objects converting to the name with `str`, such as numpy dtypes, are accepted too.
+
+    Returns:
+        str: The name of the dtype, a key of `_DTYPES`.
+
+    Raises:
+        TypeError: If the dtype is not supported.
+    """
+    if isinstance(dtype, type) and dtype in _DEFAULT_DTYPES:
+        return _DEFAULT_DTYPES[dtype]
+    if str(dtype) not in _DTYPES:
+        raise TypeError(
+            f"dtype {dtype!r} is not supported. Permitted dtypes are {', '.join(_DTYPES)}."
+        )
+    return str(dtype)
+
+
+def _promote_types(dtype, other_dtype):
+    """Returns the dtype of the result of arithmetic between arrays of two dtypes, following numpy.
+
+    The larger dtype of the same kind is used, bool is promoted to any number, and integers combined with
+    floats give float64, unless the integers have at most 16 bits and the floats are float32.
+
+    Args:
+        dtype (str): dtype of the first array.
+        other_dtype (str): dtype of the second array.
+
+    Returns:
+        str: dtype of the result.
+    """
+    datatype = _DTYPES[dtype][1]
+    other_datatype = _DTYPES[other_dtype][1]
+    if datatype == other_datatype:
+        return max(dtype, other_dtype, key=_ITEMSIZES.__getitem__)
+    if datatype == bool:
+        return other_dtype
+    if other_datatype == bool:
+        return dtype
+    integer, floating = (
+        (dtype, other_dtype) if datatype == int else (other_dtype, dtype)
+    )
+    if floating == "float32" and _ITEMSIZES[integer] <= 2:
+        return "float32"
+    return "float64"
+
+
+def _promote_scalar(dtype, value):
+    """Returns the dtype of the result of arithmetic between an array and a Python number.
+
+    Like in numpy, Python numbers only change the dtype if they are of a higher kind (bool < int < float),
+    so e.g. an int8 array times 2 stays int8 while an int8 array times 2.0 gives float64.
+
+    Args:
+        dtype (str): dtype of the array.
+        value (bool, int, float): The number.
+
+    Returns:
+        str: dtype of the result.
+    """
+    kinds = (bool, int, float)
+    value_datatype = next(kind for kind in kinds if isinstance(value, kind))
+    if kinds.index(value_datatype) <= kinds.index(_DTYPES[dtype][1]):
+        return dtype
+    return _DEFAULT_DTYPES[value_datatype]
+
+
+@functools.lru_cache(maxsize=256)
+def _contiguous_strides(shape):
+    """Returns the element strides of a row-major (C-contiguous) array of given shape.
+
+    The strides are cached, so arrays of the same shape share one strides tuple.
+
+    Args:
+        shape (tuple): Shape of the array.
+
+    Returns:
+        tuple: Number of elements to step in the flat buffer per index along each axis.
+    """
+    strides = []
+    step = 1
+    for dim in shape[::-1]:
+        strides.append(step)
+        step *= dim
+    return tuple(strides[::-1])
+
+
+def _buffer_dtype(view):
+    """Returns the Array dtype of the elements of a memoryview.
+
+    Args:
+        view (memoryview): The buffer.
+
+    Returns:
+        str: The dtype, a key of `_DTYPES`.
+
+    Raises:
+        TypeError: If the elements are not bool, signed integers or floats of a supported size.
+    """
+    format = view.format.lstrip("@")  # Native byte order and size
+    datatypes = {"?": bool, "d": float, "f": float}
+    datatypes.update(dict.fromkeys("bhilqn", int))
+    for dtype, (_, datatype) in _DTYPES.items():
+        if datatypes.get(format) == datatype and _ITEMSIZES[dtype] == view.itemsize:
+            return dtype
+    raise TypeError(
+        f"Buffers with element format {view.format!r} are not supported. Only elements of dtype {', '.join(_DTYPES)} are permitted."
+    )
+
+
+def _typestr(dtype):
+    """Returns the numpy array interface type string of the elements of a dtype, e.g. '<f8'"""
+    itemsize = _ITEMSIZES[dtype]
+    byteorder = (
+        "|" if itemsize == 1 else _BYTEORDER
+    )  # Byte order is irrelevant for single bytes
+    return f"{byteorder}{_TYPESTR_KINDS[_DTYPES[dtype][1]]}{itemsize}"
+
+
+def _read_header(file):
+    """Reads the header of a file written by `Array.save`.
+
+    Args:
+        file: Binary file object positioned at the start of the file.
+
+    Returns:
+        tuple: dtype, shape, byte order ("<" or ">") and file offset of the first element.
+
+    Raises:
+        ValueError: If the file is not an array file of a supported version.
+    """
+    header = file.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size or not header.startswith(_FILE_MAGIC):
+        raise ValueError(f"{file.name} is not an array file.")
+    _, version, byteorder, dtype, ndim = _FILE_HEADER.unpack(header)
+    if version != _FILE_VERSION:
+        raise ValueError(f"Array file version {version} is not supported.")
+    shape = struct.unpack(f"<{ndim}Q", file.read(8 * ndim))
+    offset = _FILE_HEADER.size + 8 * ndim
+    offset += -offset % _FILE_ALIGNMENT
+    return _dtype_name(dtype.rstrip(b"\0").decode()), shape, byteorder.decode(), offset
+
+
+def _sum(values, count, datatype):
+    """Returns the sum of `count` values, using `math.fsum` for floats to avoid accumulated rounding errors"""
+    if datatype == float:
+        return math.fsum(values)
+    return sum(values)
+
+
+def _mean(values, count, datatype):
+    """Returns the mean of `count` values, which is nan for no values (like numpy)"""
+    if count == 0:
+        return float("nan")
+    return _sum(values, count, datatype) / count
+
+
+def _min(values, count, datatype):
+    """Returns the smallest of `count` values"""
+    return min(values)
+
+
+def _max(values, count, datatype):
+    """Returns the largest of `count` values"""
+    return max(values)
+
+
+def _argmin(values, count, datatype):
+    """Returns the position of the first occurrence of the smallest of `count` values"""
+    return min(enumerate(values), key=operator.itemgetter(1))[0]
+
+
+def _all(values, count, datatype):
+    """Returns True if all of `count` values are true, stopping at the first false value"""
+    return all(values)
+
+
+def _any(values, count, datatype):
+    """Returns True if any of `count` values is true, stopping at the first true value"""
+    return any(values)
+
+
+# Reductions of all elements which can be computed from the reductions of chunks of the elements,
+# the mean from the sums of the chunks
+_SPLITTABLE_REDUCTIONS = (_sum, _mean, _min, _max, _all, _any)
+
+
+def set_parallel(threshold=1_000_000, workers=None):
+    """Enables parallel computation of element-wise operations and reductions of large arrays.
+
+    Element-wise arithmetic, `is_equal` and the reductions `sum`, `mean`, `min`, `max`, `all` and `any` of all
+    elements of arrays with at least `threshold` elements are split into chunks and computed on a pool of
+    worker processes, exchanging the elements through shared memory (see `parallel.py`). Only contiguous
+    arrays of equal shape, or an array and a number, are computed in parallel.
+
+    Since every parallel operation copies its operands to shared memory and waits for the workers,
+    the threshold should be large enough that computing the elements takes much longer, e.g. a million elements.
+
+    Args:
+        threshold (int): Minimum number of elements of arrays computed in parallel. None disables parallel
+            computation and stops the worker processes.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+    """
+    global _PARALLEL_THRESHOLD, _PARALLEL_WORKERS
+    _PARALLEL_THRESHOLD = threshold
+    _PARALLEL_WORKERS = workers or os.cpu_count()
+    if threshold is None and "parallel" in sys.modules:
+        sys.modules["parallel"].shutdown()
+
+
+def _parallel_workers(count):
+    """Returns the number of worker processes to compute `count` elements with, or 0 if they are computed in this process"""
+    if _PARALLEL_THRESHOLD is None or count < _PARALLEL_THRESHOLD:
+        return 0
+    return _PARALLEL_WORKERS
+
+
+def _matmul_kernel(rows, columns):
+    """Returns the matrix product of a matrix given by its rows and a matrix given by its columns.
+
+    The product is computed in tiles of `_MATMUL_BLOCK` rows and columns, so the columns of a tile are
+    reused for all of its rows while they are still cached. Every element is the dot product of a row and
+    a column, which are both contiguous lists.
+
+    Args:
+        rows (list): Rows of the left hand matrix, as lists.
+        columns (list): Columns of the right hand matrix (rows of its transpose), as lists.
+
+    Returns:
+        list: Elements of the product in row-major order.
+    """
+    num_columns = len(columns)
+    product = [0] * (len(rows) * num_columns)
+    for row_start in range(0, len(rows), _MATMUL_BLOCK):
+        row_block = rows[row_start : row_start + _MATMUL_BLOCK]
+        for column_start in range(0, num_columns, _MATMUL_BLOCK):
+            column_block = columns[column_start : column_start + _MATMUL_BLOCK]
+            for i, row in enumerate(row_block, start=row_start):
+                position = i * num_columns + column_start
+                product[position : position + len(column_block)] = [
+                    sum(map(operator.mul, row, column)) for column in column_block
+                ]
+    return product
+
+
+def _normalize_axis(axis, ndim):
+    """Returns an axis index as a non-negative number, counting negative axes from the end.
+
+    Args:
+        axis (int): The axis.
+        ndim (int): Number of dimensions of the array.
+
+    Returns:
+        int: The axis, between 0 and `ndim` - 1.
+
+    Raises:
+        ValueError: If the axis is out of bounds.
+    """
+    if not -ndim <= axis < ndim:
+        raise ValueError(f"Axis {axis} is out of bounds for array of dimension {ndim}.")
+    return axis % ndim
+
+
+def _broadcast_shapes(*shapes):
+    """Returns the shape resulting from broadcasting arrays of the given shapes against each other.
+
+    Shapes are aligned from the last axis, and two axis lengths are compatible if they are equal or one of them is 1.
+
+    Args:
+        *shapes (tuple): Shapes of the arrays.
+
+    Returns:
+        tuple: The broadcast shape.
+
+    Raises:
+        ValueError: If the shapes can not be broadcast together.
+    """
+    ndim = max(len(shape) for shape in shapes)
+    result = [1] * ndim
+    for shape in shapes:
+        for axis, dim in enumerate(shape, start=ndim - len(shape)):
+            if dim == result[axis] or dim == 1:
+                continue
+            if result[axis] != 1:
+                raise ValueError(f"Shapes {shapes} can not be broadcast together.")
+            result[axis] = dim
+    return tuple(result)
 
 
 class Array:
-    def __init__(self, shape, *values):
+    # Fixed attributes instead of an instance __dict__, which dominates the size of small arrays
+    __slots__ = ("shape", "dtype", "_buffer", "_offset", "_strides")
+
+    def __init__(self, shape, *values, dtype=None):
         """Initialize an array of 1-dimensionality. Elements can only be of type:
 
         - int
@@ -16,23 +410,27 @@ class Array:
 
         Make sure the values and shape are of the correct type.
 
-        Make sure that you check that your array actually is an array, which means it is homogeneous (one data type).
+        The array is homogeneous: all values are stored with one dtype. If no dtype is given it is the
+        smallest kind holding all values (bool < int < float), like in numpy, e.g. `Array((2,), 1, 2.0)`
+        stores two float64 elements. Empty arrays default to float64.
 
         Args:
             shape (tuple): shape of the array as a tuple. A 1D array with n elements will have shape = (n,).
-            *values: The values in the array. These should all be the same data type. Either int, float or boolean.
+            *values: The values in the array. Either int, float or boolean.
+            dtype (str, type): dtype of the elements, one of "bool", "int8", "int16", "int32", "int64",
+                "float32" or "float64". bool, int and float select "bool", "int64" and "float64".
 
         Raises:
-            TypeError: If "shape" or "values" are of the wrong type.
-            ValueError: If the values are not all of the same type.
+            TypeError: If "shape" or "values" are of the wrong type, or floats are given for an integer dtype.
             ValueError: If the number of values does not fit with the shape.
+            OverflowError: If an integer value is out of the range of the dtype.
         """
 
-        self.num_values = 1  # Number of elements stored in Array class
+        num_values = 1  # Number of elements stored in Array class
         for dim in shape:
-            self.num_values *= dim
+            num_values *= dim
 
-        if self.num_values != len(values):
+        if num_values != len(values):
             raise ValueError("Number of elements and provided elements are not equal.")
 
         if not isinstance(shape, tuple):
@@ -43,348 +441,1697 @@ class Array:
                 message = f"Array value {value} if of type {type(value)}. Only integers, floats or boolean values are permitted."
                 raise TypeError(message)
 
-        if (
-            len(values) > 1
-        ):  # We only need to assertt homogeneity if there is more than one elements in the array.
-            self.datatype = type(
-                values[0]
-            )  # Defining the datatype of the Array values from the first element of the provided values.
-            for value in values[1:]:
-                if not type(value) == self.datatype:
-                    message = f"The array elements must be of the same datatype. Currently both {self.datatype} and {type(value)} are contained in array."
-                    raise ValueError(message)
+        if dtype is None:
+            datatypes = set(map(type, values))
+            if not values or any(issubclass(datatype, float) for datatype in datatypes):
+                dtype = "float64"
+            elif datatypes == {bool}:
+                dtype = "bool"
+            else:
+                dtype = "int64"
+        else:
+            dtype = _dtype_name(dtype)
 
+        self.dtype = dtype
         self.shape = shape
-        self.values_flat = list(values)
-
-        self.values = (
-            0  # Inializing values with zero before filling with correct values
+        self._buffer = _make_buffer(
+            dtype, values
+        )  # Single flat typed buffer holding all elements in row-major (C) order
+        self._offset = 0  # Buffer index of the first element
+        self._strides = _contiguous_strides(
+            shape
+        )  # Number of buffer elements to step to move one index along each axis
+
+    @property
+    def datatype(self):
+        """Python type of the elements, either bool, int or float"""
+        return _DTYPES[self.dtype][1]
+
+    @property
+    def num_values(self):
+        """Number of elements in the array"""
+        return math.prod(self.shape)
+
+    @property
+    def nbytes(self):
+        """Number of bytes taken by the array elements in the buffer"""
+        return self.num_values * self._buffer.itemsize
+
+    def __sizeof__(self):
+        """Returns the memory footprint of the array in bytes, used by `sys.getsizeof`.
+
+        Counts the array object, its shape and strides and the memory of its elements (`nbytes`).
+        Views count the elements they address, although these are shared with the viewed array.
+        """
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self.shape)
+            + sys.getsizeof(self._strides)
+            + sys.getsizeof(self._buffer)
+            + self.nbytes
         )
 
-        if len(shape) > 1:
-            for i in shape[::-1]:  # Generating nested list of zeros with correct shape.
-                self.values = [
-                    copy.deepcopy(self.values) for _ in range(i)
-                ]  # Using copy.deepcopy() from Python's standard library
-                # To avoid linking list elements though referencing.
-
-            for index in iter.product(*map(range, shape)):
-                idx = index[0]  # Initializing flattened index as "x" index
-
-                lst = self.values[
-                    idx
-                ]  # Filling values nested list with values from flattened values list implicetly through referencing
-                counter = 0  # Empty counter
-
-                for i, sh in zip(index[1:], shape[1:]):
-                    idx = sh * idx + i  # Iterative solving for flattened index
-                    if counter < len(shape[2:]):
-                        lst = lst[i]
-                    else:
-                        lst[i] = self.values_flat[
-                            idx
-                        ]  # Setting value from flattened values through referencing
-
-                    counter += 1  # Updating counter
-        else:
-            self.values = list(values)
-
-    def __getitem__(self, idx):
-        """Returns Array element at given index
+    @property
+    def values(self):
+        """Nested list representation of the array, built on demand from the flat buffer.
 
-        Args:
-            idx (int): Index at which Array element is to be returned.
+        Returns:
+            list: The array elements as a (nested) list of shape `shape`.
         """
-        return self.values[idx]
+        if len(self.shape) == 0:
+            return self._buffer[self._offset]
+        return self._nested(self._offset, 0)
 
-    def __str__(self):
-        """Returns a nicely printable string representation of the array.
+    @property
+    def values_flat(self):
+        """Flat list of the array elements in row-major order.
 
         Returns:
-            str: A string representation of the array.
-
+            list: The array elements as a flat list.
         """
+        return list(self._iter_values())
 
-        return str(self.values)
-
-    def __add__(self, other):
-        """Element-wise adds Array with another Array or number.
+    @classmethod
+    def _from_buffer(cls, shape, dtype, buffer, strides=None, offset=0):
+        """Creates an Array directly from a flat typed buffer, skipping all validation.
 
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+        Only for internal use on buffers which are already known to be valid, such as results of
+        array operations. The buffer is used as is, not copied.
 
         Args:
-            other (Array, float, int): The array or number to add element-wise to this array.
+            shape (tuple): Shape of the array.
+            dtype (str): dtype of the buffer, a key of `_DTYPES`.
+            buffer (memoryview): Flat buffer as returned by `_make_buffer`.
+            strides (tuple): Element strides of the array in the buffer. Defaults to row-major order.
+            offset (int): Buffer index of the first element.
 
         Returns:
-            Array: the sum as a new array.
-
+            Array: The new array.
         """
+        new = cls.__new__(cls)
+        new.dtype = dtype
+        new.shape = shape
+        new._buffer = buffer
+        new._offset = offset
+        new._strides = _contiguous_strides(shape) if strides is None else strides
+        return new
 
-        if not isinstance(other, Array):
-            return NotImplemented
-        elif self.shape != other.shape:
-            return NotImplemented
-        elif self.datatype == bool or other.datatype == bool:
-            return NotImplemented
-        else:
-            new_values = []
-            for i in range(self.num_values):
-                new_values.append(self.values_flat[i] + other.values_flat[i])
-            return Array(self.shape, *new_values)
-
-    def __radd__(self, other):
-        """Element-wise adds Array with another Array or number.
+    @classmethod
+    def from_buffer(cls, buffer, shape=None):
+        """Creates an Array sharing the memory of an object supporting the buffer protocol.
 
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+        The elements are not copied, so changes made through the Array are visible in the object and vice versa.
+        Supported objects include `array.array`, `bytearray`, `memoryview` and C-contiguous numpy arrays.
 
         Args:
-            other (Array, float, int): The array or number to add element-wise to this array.
+            buffer: Object supporting the buffer protocol, holding C-contiguous elements of a dtype
+                supported by Array: bool, 8 to 64-bit signed integers, or 32 or 64-bit floats.
+            shape (tuple): Shape of the array. Defaults to the shape of the buffer.
 
         Returns:
-            Array: the sum as a new array.
+            Array: The new array.
 
+        Raises:
+            TypeError: If the elements of the buffer are of an unsupported type.
+            ValueError: If the buffer is not C-contiguous, or the shape does not fit the number of elements.
         """
-        if not isinstance(other, Array):
+        view = memoryview(buffer)
+        dtype = _buffer_dtype(view)
+        if not view.c_contiguous:
+            raise ValueError("Only C-contiguous buffers can be shared by an Array.")
+        if shape is None:
+            shape = view.shape
+        shape = tuple(shape)
+
+        flat = view.cast("B").cast(
+            _DTYPES[dtype][0]
+        )  # One-dimensional view of the elements in the native format of the dtype
+        if math.prod(shape) != len(flat):
+            raise ValueError(
+                f"Shape {shape} does not fit the {len(flat)} elements of the buffer."
+            )
+        return cls._from_buffer(shape, dtype, flat)
 
-            new_values = []
-            if isinstance(other, (int, float)):
-                for value in self.values_flat:
-                    new_values.append(other + value)
+    @classmethod
+    def from_numpy(cls, ndarray):
+        """Creates an Array sharing the memory of a numpy array.
 
-            if isinstance(other, (bool)):
-                return NotImplemented
-        else:
-            if self.shape != other.shape:
-                # TODO: implement addition for two Array classes with different shapes?
-                return NotImplemented
+        Non-contiguous numpy arrays are first copied to a contiguous array, which the Array then shares.
+
+        Args:
+            ndarray (numpy.ndarray): Array of dtype bool, int8, int16, int32, int64, float32 or float64.
 
-        return Array(self.shape, *new_values)
+        Returns:
+            Array: The new array, with the same shape as `ndarray`.
 
-    def __sub__(self, other):
-        """Element-wise subtracts an Array or number from this Array.
+        Raises:
+            TypeError: If the dtype of `ndarray` is not supported.
+        """
+        if not ndarray.flags.c_contiguous:
+            ndarray = ndarray.copy(order="C")
+        return cls.from_buffer(ndarray, ndarray.shape)
 
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+    @classmethod
+    def memmap(cls, path, dtype="float64", shape=None, mode="r+", offset=0):
+        """Creates an Array backed by a memory-mapped file.
+
+        The elements are read from and written to the file on demand by the operating system, so the
+        array can be larger than the available memory. Reductions, in-place operations and
+        `LazyArray.evaluate(out=...)` stream over the elements in blocks.
 
         Args:
-            other (Array, float, int): The array or number to subtract element-wise from this array.
+            path (str): Path of the file holding the elements in row-major order.
+            dtype (str, type): dtype of the elements, see `__init__`.
+            shape (tuple): Shape of the array. Defaults to a 1-D array of all elements in the file.
+                Required for mode "w+".
+            mode (str): "r" to only read, "r+" to read and write an existing file, "w+" to create or
+                overwrite the file, and "c" for copy-on-write, where changes are not written to the file.
+            offset (int): Byte offset of the first element in the file.
 
         Returns:
-            Array: the difference as a new array.
+            Array: The memory-mapped array.
 
+        Raises:
+            ValueError: If the mode is unknown, no shape is given for mode "w+", or the file is too small.
         """
-        if not isinstance(other, Array):
-            return NotImplemented
-        elif self.shape != other.shape:
-            return NotImplemented
-        elif self.datatype == bool or other.datatype == bool:
-            return NotImplemented
+        dtype = _dtype_name(dtype)
+        if mode not in _MMAP_ACCESS:
+            raise ValueError(
+                f"Mode {mode!r} is not supported. Permitted modes are {', '.join(_MMAP_ACCESS)}."
+            )
+        itemsize = _ITEMSIZES[dtype]
+        if mode == "w+":
+            if shape is None:
+                raise ValueError("A shape is required to create a memory-mapped file.")
+            with open(path, "w+b") as file:
+                file.truncate(offset + math.prod(shape) * itemsize)
+                mapping = mmap.mmap(file.fileno(), 0, access=_MMAP_ACCESS[mode])
         else:
-            new_values = []
-            for i in range(self.num_values):
-                new_values.append(self.values_flat[i] - other.values_flat[i])
-            return Array(self.shape, *new_values)
+            with open(path, "r+b" if mode == "r+" else "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=_MMAP_ACCESS[mode])
+            if shape is None:
+                shape = ((len(mapping) - offset) // itemsize,)
+        shape = tuple(shape)
+
+        nbytes = math.prod(shape) * itemsize
+        if offset + nbytes > len(mapping):
+            raise ValueError(f"File {path} is too small for an array of shape {shape}.")
+        # The mapping stays open as long as the buffer (or a view of it) is referenced
+        buffer = memoryview(mapping)[offset : offset + nbytes].cast(_DTYPES[dtype][0])
+        return cls._from_buffer(shape, dtype, buffer)
+
+    def flush(self):
+        """Writes changes of a memory-mapped array to its file. Does nothing for other arrays."""
+        if isinstance(self._buffer.obj, mmap.mmap):
+            self._buffer.obj.flush()
+
+    def save(self, path):
+        """Saves the array to a binary file, which can be read with `load`.
+
+        The file has a small header with the dtype and shape, followed by the elements in row-major order.
+        Non-contiguous arrays are written in blocks of `_BLOCK_SIZE` elements without copying the whole array.
 
-    def __rsub__(self, other):
-        """Element-wise subtracts this Array from a number or Array.
+        Args:
+            path (str): Path of the file.
+        """
+        ndim = len(self.shape)
+        header = _FILE_HEADER.pack(
+            _FILE_MAGIC, _FILE_VERSION, _BYTEORDER.encode(), self.dtype.encode(), ndim
+        )
+        header += struct.pack(f"<{ndim}Q", *self.shape)
+        header += bytes(-len(header) % _FILE_ALIGNMENT)
 
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+        with open(path, "wb") as file:
+            file.write(header)
+            if self._is_contiguous():
+                file.write(self._buffer[self._offset : self._offset + self.num_values])
+            else:
+                values = self._iter_values()
+                for _ in range(0, self.num_values, _BLOCK_SIZE):
+                    file.write(
+                        _make_buffer(self.dtype, itertools.islice(values, _BLOCK_SIZE))
+                    )
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """Loads an array saved with `save`.
 
         Args:
-            other (Array, float, int): The array or number being subtracted from.
+            path (str): Path of the file.
+            mmap_mode (str): If given, the array is memory-mapped with this mode instead of read into
+                memory, see `memmap`.
 
         Returns:
-            Array: the difference as a new array.
+            Array: The loaded array.
 
+        Raises:
+            ValueError: If the file is not an array file, is truncated, or is memory-mapped
+                while its elements are not in the native byte order.
         """
-        if not isinstance(other, Array):
+        with open(path, "rb") as file:
+            dtype, shape, byteorder, offset = _read_header(file)
+            if mmap_mode is None:
+                file.seek(offset)
+                typecode = _DTYPES[dtype][0]
+                elements = array.array("B" if typecode == "?" else typecode)
+                try:
+                    elements.fromfile(file, math.prod(shape))
+                except EOFError:
+                    raise ValueError(f"Array file {path} is truncated.") from None
+                if byteorder != _BYTEORDER:
+                    elements.byteswap()
+                buffer = memoryview(elements)
+                if typecode == "?":
+                    buffer = buffer.cast(
+                        "?"
+                    )  # Booleans are read as bytes, see `_make_buffer`
+                return cls._from_buffer(shape, dtype, buffer)
+
+        if byteorder != _BYTEORDER:
+            raise ValueError(
+                f"Array file {path} can not be memory-mapped, since its byte order is not native."
+            )
+        return cls.memmap(path, dtype, shape, mmap_mode, offset)
 
-            new_values = []
+    @property
+    def __array_interface__(self):
+        """The numpy array interface of the array.
 
-            if isinstance(other, (int, float)):
-                for value in self.values_flat:
-                    new_values.append(other - value)
+        Lets `numpy.asarray` create a numpy array sharing the buffer of this array without copying.
 
-            if isinstance(other, (bool)):
-                return NotImplemented
+        Returns:
+            dict: Description of the shape, element type and memory layout of the array.
+        """
+        itemsize = self._buffer.itemsize
+        if self._is_contiguous():
+            strides = None
         else:
-            if self.shape != other.shape:
-                # TODO: implement subtraction for two Array classes with different shapes, i.e. broadcasting?
-                return NotImplemented
+            strides = tuple(stride * itemsize for stride in self._strides)
+        return {
+            "version": 3,
+            "shape": self.shape,
+            "typestr": _typestr(self.dtype),
+            "data": self._buffer,
+            "offset": self._offset * itemsize,
+            "strides": strides,
+        }
 
-        return Array(self.shape, *new_values)
+    def __array__(self, dtype=None, copy=None):
+        """Returns a numpy array of the elements.
 
-    def __mul__(self, other):
-        """Element-wise multiplies this Array with a number or array.
-
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+        The numpy array shares the buffer of this array, unless a copy or another dtype is requested.
 
         Args:
-            other (Array, float, int): The array or number to multiply element-wise to this array.
+            dtype (numpy.dtype): dtype of the numpy array. Defaults to the dtype of the array.
+            copy (bool): If True the elements are copied.
 
         Returns:
-            Array: a new array with every element multiplied with `other`.
+            numpy.ndarray: The numpy array.
+        """
+        import numpy  # Optional dependency, only needed when converting to numpy
+
+        # numpy creates the array from __array_interface__, so this does not call __array__ again
+        ndarray = numpy.asarray(self, dtype=dtype)
+        if copy:
+            ndarray = ndarray.copy()
+        return ndarray
+
+    def to_memoryview(self):
+        """Returns a memoryview of the array elements, sharing the buffer of the array.
+
+        Returns:
+            memoryview: View with the same shape as the array.
 
+        Raises:
+            BufferError: If the array is a view whose elements are not contiguous in the buffer.
         """
-        if not isinstance(other, Array):
-            return NotImplemented
-        elif self.shape != other.shape:
-            return NotImplemented
-        elif self.datatype == bool or other.datatype == bool:
-            return NotImplemented
-        else:
-            new_values = []
-            for i in range(self.num_values):
-                new_values.append(self.values_flat[i] * other.values_flat[i])
-            return Array(self.shape, *new_values)
+        if not self._is_contiguous():
+            raise BufferError(
+                "Only arrays with contiguous elements can be exported as memoryview."
+            )
+        flat = self._buffer[self._offset : self._offset + self.num_values]
+        return flat.cast("B").cast(flat.format, self.shape)
 
-    def __rmul__(self, other):
-        """Element-wise multiplies this Array with a number or array.
+    def __buffer__(self, flags):
+        """Exports the array elements through the buffer protocol (Python 3.12+), see `to_memoryview`."""
+        return self.to_memoryview()
 
-        If the method does not support the operation with the supplied arguments
-        (specific data type or shape), it should return NotImplemented.
+    def __release_buffer__(self, view):
+        """Releases a memoryview exported by `__buffer__`."""
+        view.release()
+
+    def _view(self, shape, strides, offset):
+        """Returns a new Array sharing this array's buffer.
+
+        No elements are copied, so changes made through the view are visible in this array and vice versa.
 
         Args:
-            other (Array, float, int): The array or number to multiply element-wise to this array.
+            shape (tuple): Shape of the view.
+            strides (tuple): Element strides of the view in the shared buffer.
+            offset (int): Buffer index of the first element of the view.
 
         Returns:
-            Array: a new array with every element multiplied with `other`.
+            Array: The view.
+        """
+        return Array._from_buffer(shape, self.dtype, self._buffer, strides, offset)
 
+    def _is_contiguous(self):
+        """Returns True if the elements are stored in row-major order without gaps"""
+        return self._strides == _contiguous_strides(self.shape)
+
+    def _row_starts(self):
+        """Returns the buffer index of the first element of every row (run along the last axis) in row-major order"""
+        row_starts = [self._offset]
+        for dim, stride in zip(self.shape[:-1], self._strides[:-1]):
+            row_starts = [
+                start + i * stride for start in row_starts for i in range(dim)
+            ]
+        return row_starts
+
+    def _rows(self):
+        """Returns an iterator over the rows (runs along the last axis) of the array in row-major order.
+
+        Every row is a strided slice of the buffer, so iterating over its elements does not copy them.
         """
-        # Hint: this solution/logic applies for all r-methods
-        # return self.__mul__(other)
+        length = self.shape[-1]
+        stride = self._strides[-1]
+        for start in self._row_starts():
+            if stride == 0:  # Broadcast last axis repeats the same element
+                yield [self._buffer[start]] * length
+            else:
+                stop = start + length * stride
+                if stop < 0:  # Reversed row ending at the first buffer element
+                    stop = None
+                yield self._buffer[start:stop:stride]
+
+    def _positions(self):
+        """Returns an iterator over the buffer indices of the array elements in row-major order"""
+        if len(self.shape) == 0:
+            return iter((self._offset,))
+
+        length = self.shape[-1]
+        stride = self._strides[-1]
+        if stride == 0:  # Broadcast last axis repeats the same element
+            return itertools.chain.from_iterable(
+                itertools.repeat(start, length) for start in self._row_starts()
+            )
+        return itertools.chain.from_iterable(
+            range(start, start + length * stride, stride)
+            for start in self._row_starts()
+        )
 
-        if not isinstance(other, Array):
+    def _iter_values(self):
+        """Returns an iterator over the array elements in row-major order"""
+        if self._is_contiguous():
+            return iter(self._buffer[self._offset : self._offset + self.num_values])
+        if len(self.shape) == 0:
+            return iter((self._buffer[self._offset],))
+        return itertools.chain.from_iterable(self._rows())
 
-            new_values = []
+    def _assign(self, new_values):
+        """Writes values into the array elements in row-major order.
 
-            if isinstance(other, (int, float)):
-                for value in self.values_flat:
-                    new_values.append(other * value)
+        Contiguous arrays are written in blocks of `_BLOCK_SIZE` elements, so no buffer of the full array size
+        is allocated.
 
-            if isinstance(other, (bool)):
-                return NotImplemented
+        Args:
+            new_values (iterable): One value for every element of the array.
+
+        Raises:
+            OverflowError: If an integer value is out of the range of the dtype of the array.
+        """
+        new_values = iter(new_values)
+        if self._is_contiguous():
+            end = self._offset + self.num_values
+            for start in range(self._offset, end, _BLOCK_SIZE):
+                stop = min(start + _BLOCK_SIZE, end)
+                self._buffer[start:stop] = _make_buffer(
+                    self.dtype, itertools.islice(new_values, stop - start)
+                )
         else:
-            if self.shape != other.shape:
-                # TODO: implement subtraction for two Array classes with different shapes, i.e. broadcasting?
-                return NotImplemented
+            for position, new_value in zip(self._positions(), new_values):
+                try:
+                    self._buffer[position] = new_value
+                except (
+                    ValueError
+                ):  # memoryview reports values out of range as ValueError
+                    raise OverflowError(
+                        f"Value {new_value} is out of the range of dtype {self.dtype}."
+                    ) from None
+
+    def _nested(self, offset, axis):
+        """Builds the nested list of the sub-array starting at buffer index `offset` and axis `axis`.
 
-        return Array(self.shape, *new_values)
+        Args:
+            offset (int): Buffer index of the first element of the sub-array.
+            axis (int): First axis of the sub-array.
 
-    def __eq__(self, other):
-        """Compares an Array with another Array.
+        Returns:
+            list: Nested list of the sub-array elements.
+        """
+        stride = self._strides[axis]
+        if stride == 0:  # Broadcast axis repeats the same sub-array
+            positions = itertools.repeat(offset, self.shape[axis])
+        else:
+            positions = range(offset, offset + self.shape[axis] * stride, stride)
+        if axis == len(self.shape) - 1:
+            return list(map(self._buffer.__getitem__, positions))
+        return [self._nested(position, axis + 1) for position in positions]
 
-        If the two array shapes do not match, it should return False.
-        If `other` is an unexpected type, return False.
+    def _locate(self, idx):
+        """Translates an index into the layout of the selected sub-array.
 
         Args:
-            other (Array): The array to compare with this array.
+            idx (int, slice, tuple): Index with one int or slice per leading axis.
 
         Returns:
-            bool: True if the two arrays are equal (identical). False otherwise.
+            tuple: Shape, strides and buffer offset of the selection.
+                   The shape is empty if a single element is selected.
 
+        Raises:
+            IndexError: If there are too many indices or an index is out of bounds.
+            TypeError: If an index is not an int or a slice.
         """
-        if not isinstance(other, (Array, float, int, bool)):
-            return False
-        else:
-            if isinstance(other, Array):
-                if self.datatype != other.datatype:
-                    return False
-                elif self.shape != other.shape:
-                    return False
+        if not isinstance(idx, tuple):
+            idx = (idx,)
+        if len(idx) > len(self.shape):
+            raise IndexError(
+                f"Too many indices for array: array is {len(self.shape)}-dimensional, but {len(idx)} were indexed."
+            )
 
-            bools = self.is_equal(other)
-            if False in bools:
-                return False
+        shape = []
+        strides = []
+        offset = self._offset
+        for axis, (index, dim, stride) in enumerate(
+            zip(idx, self.shape, self._strides)
+        ):
+            if isinstance(index, slice):
+                start, stop, step = index.indices(dim)
+                shape.append(len(range(start, stop, step)))
+                strides.append(stride * step)
+                offset += start * stride
             else:
-                return True
+                try:
+                    if isinstance(index, bool):
+                        raise TypeError
+                    index = operator.index(index)  # Also accepts e.g. numpy integers
+                except TypeError:
+                    raise TypeError(
+                        f"Array indices must be integers or slices, not {type(index)}."
+                    ) from None
+                if index < 0:
+                    index += dim  # Negative indices count from the end, like for lists
+                if not 0 <= index < dim:
+                    raise IndexError(
+                        f"Index {index} is out of bounds for axis {axis} with size {dim}."
+                    )
+                offset += index * stride
 
-    def is_equal(self, other):
-        """Compares an Array element-wise with another Array or number.
+        # Axes without an index are kept whole
+        shape.extend(self.shape[len(idx) :])
+        strides.extend(self._strides[len(idx) :])
+        return tuple(shape), tuple(strides), offset
 
-        If `other` is an array and the two array shapes do not match, this method should raise ValueError.
-        If `other` is not an array or a number, it should return TypeError.
+    def _check_assignable(self, datatype):
+        """Raises TypeError if values of type `datatype` can not be stored in this array without changing its datatype"""
+        if datatype not in _DEFAULT_DTYPES:
+            raise TypeError(
+                f"Array values of type {datatype} are not permitted. Only integers, floats or boolean values are permitted."
+            )
+        if (self.datatype == bool and datatype != bool) or (
+            self.datatype == int and datatype == float
+        ):
+            raise TypeError(
+                f"Can not assign values of type {datatype} to array of datatype {self.datatype}."
+            )
+
+    def __len__(self):
+        """Returns the length of the first axis of the array"""
+        if len(self.shape) == 0:
+            raise TypeError("len() of unsized object.")
+        return self.shape[0]
+
+    def __getitem__(self, idx):
+        """Returns Array element or sub-array at given index
+
+        Integers select a single position along an axis, slices (including negative steps) select a range.
+        Selecting a sub-array returns a view sharing the buffer of this array, so no elements are copied.
 
         Args:
-            other (Array, float, int): The array or number to compare with this array.
+            idx (int, slice, tuple): Index at which Array element is to be returned. Use a tuple to index several axes, e.g. `a[1:5, ::2]`.
 
         Returns:
-            Array: An array of booleans with True where the two arrays match and False where they do not.
-                   Or if `other` is a number, it returns True where the array is equal to the number and False
-                   where it is not.
+            int, float, bool or Array: The selected element, or a view of the selected sub-array.
+        """
+        shape, strides, offset = self._locate(idx)
+        if len(shape) == 0:
+            return self._buffer[offset]
+        return self._view(shape, strides, offset)
 
-        Raises:
-            ValueError: if the shape of self and other are not equal.
+    def __setitem__(self, idx, value):
+        """Assigns a value to the Array element or sub-array at given index
+
+        Args:
+            idx (int, slice, tuple): Index at which to assign, see `__getitem__`.
+            value (Array, float, int, bool): Value to assign. A number is assigned to every selected element,
+                while an Array is broadcast to the shape of the selection.
 
+        Raises:
+            TypeError: If `value` does not fit the datatype of the array.
+            ValueError: If `value` is an Array which can not be broadcast to the shape of the selection.
         """
-        if not isinstance(other, (Array, float, int, bool)):
-            raise TypeError(f"Cannot compare Array with object of type {type(other)}.")
+        shape, strides, offset = self._locate(idx)
+        target = self._view(shape, strides, offset)
+
+        if isinstance(value, Array):
+            try:
+                broadcast_shape = _broadcast_shapes(value.shape, target.shape)
+            except ValueError:
+                broadcast_shape = None
+            if broadcast_shape != target.shape:
+                raise ValueError(
+                    f"Could not assign array of shape {value.shape} to selection of shape {target.shape}."
+                )
+            self._check_assignable(value.datatype)
+            new_values = value._broadcast_to(target.shape)._iter_values()
+            if value._buffer is self._buffer:
+                new_values = list(
+                    new_values
+                )  # Reading all values before writing, in case the two regions overlap
         else:
-            new_values = []
-            if isinstance(other, Array):
-                if self.shape != other.shape:
-                    raise ValueError(
-                        "To compare two objects of type Array their shapes must match."
-                    )
+            self._check_assignable(type(value))
+            new_values = itertools.repeat(value)
+
+        target._assign(new_values)
 
-                for i in range(self.num_values):
-                    new_values.append(self.values_flat[i] == other.values_flat[i])
+    def __str__(self):
+        """Returns a nicely printable string representation of the array.
 
-            if isinstance(other, (float, int, bool)):
-                for i in range(self.num_values):
-                    new_values.append(self.values_flat[i] == other)
+        Returns:
+            str: A string representation of the array.
 
-            return Array(self.shape, *new_values)
+        """
 
-    def min_element(self):
-        """Returns the smallest value of the array.
+        return str(self.values)
 
-        Only needs to work for type int and float (not boolean).
+    def reshape(self, *shape):
+        """Returns the array with a new shape and the same elements in row-major order.
+
+        Contiguous arrays are reshaped by only changing the shape and strides, so the result is a view
+        sharing the buffer of this array. Other arrays, such as strided or broadcast views, are copied first.
+
+        Args:
+            *shape (int): The new shape, given as a tuple or as separate ints. One axis length may be -1,
+                which is then inferred from the number of elements.
 
         Returns:
-            float: The value of the smallest element in the array.
+            Array: The reshaped array.
 
+        Raises:
+            ValueError: If the new shape does not fit the number of elements.
         """
-
-        if self.datatype == bool:
-            raise TypeError(
-                "Can only find minimum of array if it is of datatype integer of float."
+        if len(shape) == 1 and isinstance(shape[0], tuple):
+            shape = shape[0]
+        shape = list(shape)
+        if shape.count(-1) > 1:
+            raise ValueError("Only one axis length can be inferred in a reshape.")
+        if -1 in shape:
+            known = math.prod(dim for dim in shape if dim != -1)
+            if known == 0 or self.num_values % known:
+                raise ValueError(
+                    f"Can not reshape array of {self.num_values} elements into shape {tuple(shape)}."
+                )
+            shape[shape.index(-1)] = self.num_values // known
+        shape = tuple(shape)
+        if math.prod(shape) != self.num_values or any(dim < 0 for dim in shape):
+            raise ValueError(
+                f"Can not reshape array of {self.num_values} elements into shape {shape}."
             )
 
-        min_elem = self.values_flat[
-            0
-        ]  # Initializing minimum value with first array element
+        if self._is_contiguous():
+            return self._view(shape, _contiguous_strides(shape), self._offset)
+        buffer = _make_buffer(self.dtype, self._iter_values())
+        return Array._from_buffer(shape, self.dtype, buffer)
 
-        for value in self.values_flat[1:]:
-            if value < min_elem:
-                min_elem = value
+    def ravel(self):
+        """Returns the elements as a 1-D array in row-major order.
 
-        return min_elem
+        Like `reshape`, the result is a view of contiguous arrays and a copy of other arrays.
 
-    def mean_element(self):
-        """Returns the mean value of an array
+        Returns:
+            Array: The flattened array.
+        """
+        return self.reshape(self.num_values)
 
-        Only needs to work for type int and float (not boolean).
+    def flatten(self):
+        """Returns a copy of the elements as a 1-D array in row-major order.
 
         Returns:
-            float: the mean value
+            Array: A new flattened array, which never shares the buffer of this array.
         """
+        buffer = _make_buffer(self.dtype, self._iter_values())
+        return Array._from_buffer((self.num_values,), self.dtype, buffer)
 
-        if self.datatype == bool:
-            raise TypeError(
-                "Can only find mean of array if it is of datatype integer of float."
-            )
+    def transpose(self, *axes):
+        """Returns a view of the array with its axes permuted.
 
-        mean = 0
-        for value in self.values_flat:
-            mean += value  # Cumulative sum of array elements
+        Only the shape and strides are reordered, so no elements are copied.
+
+        Args:
+            *axes (int): The new order of the axes, given as a tuple or as separate ints.
+                Defaults to the reversed order, which transposes a matrix.
 
-        N = 1
-        for dim in self.shape:
-            N *= dim  # Total number of elements in array along all dimensions
+        Returns:
+            Array: The transposed view.
 
-        return mean / N
+        Raises:
+            ValueError: If the axes are not a permutation of the axes of the array.
+        """
+        ndim = len(self.shape)
+        if len(axes) == 1 and isinstance(axes[0], tuple):
+            axes = axes[0]
+        if not axes:
+            axes = range(ndim)[::-1]
+        axes = [_normalize_axis(axis, ndim) for axis in axes]
+        if sorted(axes) != list(range(ndim)):
+            raise ValueError(
+                f"Axes {tuple(axes)} are not a permutation of the axes of an array of dimension {ndim}."
+            )
+        return self._view(
+            tuple(self.shape[axis] for axis in axes),
+            tuple(self._strides[axis] for axis in axes),
+            self._offset,
+        )
+
+    @property
+    def T(self):
+        """The transposed array (with reversed axes) as a view, see `transpose`"""
+        return self.transpose()
+
+    def swapaxes(self, axis1, axis2):
+        """Returns a view of the array with two axes interchanged.
+
+        Args:
+            axis1 (int): The first axis.
+            axis2 (int): The second axis.
+
+        Returns:
+            Array: The view, sharing the buffer of this array.
+
+        Raises:
+            ValueError: If an axis is out of bounds.
+        """
+        axes = list(range(len(self.shape)))
+        axis1 = _normalize_axis(axis1, len(self.shape))
+        axis2 = _normalize_axis(axis2, len(self.shape))
+        axes[axis1], axes[axis2] = axes[axis2], axes[axis1]
+        return self.transpose(tuple(axes))
+
+    def _broadcast_to(self, shape):
+        """Returns a view of the array broadcast to a larger shape.
+
+        Broadcast axes get stride zero, so every element along them refers to the same buffer element
+        and the expanded array is never materialised.
+
+        Args:
+            shape (tuple): Shape to broadcast to, as returned by `_broadcast_shapes`.
+
+        Returns:
+            Array: The broadcast view.
+        """
+        if shape == self.shape:
+            return self
+        strides = [0] * (len(shape) - len(self.shape))  # New leading axes
+        for dim, stride in zip(self.shape, self._strides):
+            strides.append(0 if dim == 1 else stride)
+        return self._view(shape, tuple(strides), self._offset)
+
+    def _flat_buffer(self):
+        """Returns the elements as a flat slice of the buffer, or None if they are not contiguous"""
+        if not self._is_contiguous():
+            return None
+        return self._buffer[self._offset : self._offset + self.num_values]
+
+    def _parallel_elementwise(self, other, operation, dtype, reflected=False):
+        """Computes an element-wise operation on the process pool, see `set_parallel`.
+
+        Args:
+            other (Array, float, int, bool): The second operand.
+            operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+            dtype (str): dtype of the result.
+            reflected (bool): If True `other` is the left operand of the operation.
+
+        Returns:
+            memoryview: Flat buffer of the result, or None if the operation is computed in this process,
+                since the array is small or an operand is broadcast or not contiguous.
+        """
+        workers = _parallel_workers(self.num_values)
+        operands = [self._flat_buffer(), other]
+        if isinstance(other, Array):
+            operands[1] = other._flat_buffer() if other.shape == self.shape else None
+        if not workers or operands[0] is None or operands[1] is None:
+            return None
+        if reflected:
+            operands.reverse()
+
+        import parallel  # Only imported when parallel computation is enabled
+
+        return parallel.elementwise(
+            operation, operands, _DTYPES[dtype][0], self.num_values, workers
+        )
+
+    def _elementwise(self, other, operation, reflected=False):
+        """Applies a binary operation element-wise between this array and another Array or number.
+
+        The operands are broadcast to a common shape and the result is computed in a single pass
+        over the elements. The dtype of the result follows the numpy promotion rules, see `_promote_types`
+        and `_promote_scalar`.
+
+        Args:
+            other (Array, float, int): The second operand.
+            operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+            reflected (bool): If True `other` is the left operand of the operation.
+
+        Returns:
+            Array: A new array with the result, or NotImplemented if the operands are not supported.
+
+        Raises:
+            OverflowError: If an integer result is out of the range of the result dtype.
+        """
+        if self.datatype == bool:
+            return NotImplemented
+
+        if isinstance(other, Array):
+            if other.datatype == bool:
+                return NotImplemented
+            try:
+                shape = _broadcast_shapes(self.shape, other.shape)
+            except ValueError:
+                return NotImplemented
+            own_values = self._broadcast_to(shape)._iter_values()
+            other_values = other._broadcast_to(shape)._iter_values()
+            dtype = _promote_types(self.dtype, other.dtype)
+        elif isinstance(other, (int, float)) and not isinstance(other, bool):
+            shape = self.shape
+            own_values = self._iter_values()
+            other_values = itertools.repeat(other)
+            dtype = _promote_scalar(self.dtype, other)
+        else:
+            return NotImplemented
+
+        buffer = self._parallel_elementwise(other, operation, dtype, reflected)
+        if buffer is None:
+            if reflected:
+                own_values, other_values = other_values, own_values
+            buffer = _make_buffer(dtype, map(operation, own_values, other_values))
+        return Array._from_buffer(shape, dtype, buffer)
+
+    def __add__(self, other):
+        """Element-wise adds Array with another Array or number.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number to add element-wise to this array.
+
+        Returns:
+            Array: the sum as a new array.
+
+        """
+        return self._elementwise(other, operator.add)
+
+    def __radd__(self, other):
+        """Element-wise adds Array with another Array or number.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number to add element-wise to this array.
+
+        Returns:
+            Array: the sum as a new array.
+
+        """
+        return self._elementwise(other, operator.add, reflected=True)
+
+    def __sub__(self, other):
+        """Element-wise subtracts an Array or number from this Array.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number to subtract element-wise from this array.
+
+        Returns:
+            Array: the difference as a new array.
+
+        """
+        return self._elementwise(other, operator.sub)
+
+    def __rsub__(self, other):
+        """Element-wise subtracts this Array from a number or Array.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number being subtracted from.
+
+        Returns:
+            Array: the difference as a new array.
+
+        """
+        return self._elementwise(other, operator.sub, reflected=True)
+
+    def __mul__(self, other):
+        """Element-wise multiplies this Array with a number or array.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number to multiply element-wise to this array.
+
+        Returns:
+            Array: a new array with every element multiplied with `other`.
+
+        """
+        return self._elementwise(other, operator.mul)
+
+    def __rmul__(self, other):
+        """Element-wise multiplies this Array with a number or array.
+
+        Arrays of different shapes are broadcast against each other following the numpy rules,
+        and a number is applied to every element.
+        If the method does not support the operation with the supplied arguments
+        (specific data type or shape), it should return NotImplemented.
+
+        Args:
+            other (Array, float, int): The array or number to multiply element-wise to this array.
+
+        Returns:
+            Array: a new array with every element multiplied with `other`.
+
+        """
+        return self._elementwise(other, operator.mul, reflected=True)
+
+    def __matmul__(self, other):
+        """Matrix multiplies this Array with another Array (the `@` operator).
+
+        Follows the numpy rules: 2-D arrays are multiplied as matrices, arrays with more dimensions are
+        treated as stacks of matrices in the last two axes (broadcast against each other), and a 1-D
+        array is treated as a row vector on the left or a column vector on the right, with that axis
+        removed from the result.
+
+        Args:
+            other (Array): The right hand matrix.
+
+        Returns:
+            Array: the matrix product as a new array, or NotImplemented if `other` is not a numeric Array.
+                The product of two 1-D arrays is returned as a number.
+
+        Raises:
+            ValueError: If an array is 0-D, the inner dimensions do not match, or the
+                stack dimensions can not be broadcast together.
+        """
+        if not isinstance(other, Array):
+            return NotImplemented
+        if self.datatype == bool or other.datatype == bool:
+            return NotImplemented
+        if len(self.shape) == 0 or len(other.shape) == 0:
+            raise ValueError("Matrix multiplication is not defined for 0-D arrays.")
+
+        # Treating vectors as matrices with a single row or column
+        left = self
+        if len(self.shape) == 1:
+            left = self._view((1,) + self.shape, (0,) + self._strides, self._offset)
+        right = other
+        if len(other.shape) == 1:
+            right = other._view(
+                other.shape + (1,), other._strides + (0,), other._offset
+            )
+
+        *left_stack, rows, inner = left.shape
+        *right_stack, right_inner, columns = right.shape
+        if inner != right_inner:
+            raise ValueError(
+                f"Inner dimensions of arrays with shapes {self.shape} and {other.shape} do not match."
+            )
+        stack = _broadcast_shapes(tuple(left_stack), tuple(right_stack))
+        left = left._broadcast_to(stack + (rows, inner))
+        right = right._broadcast_to(stack + (inner, columns))
+
+        new_values = []
+        # Columns of the right hand matrices by buffer offset, reused when broadcast along the stack
+        transposed = {}
+        for index in itertools.product(*map(range, stack)):
+            matrix = right[index]
+            if matrix._offset not in transposed:
+                transposed[matrix._offset] = [
+                    list(column) for column in matrix.T._rows()
+                ]
+            left_rows = [list(row) for row in left[index]._rows()]
+            new_values.extend(_matmul_kernel(left_rows, transposed[matrix._offset]))
+
+        shape = stack + (rows, columns)
+        if len(other.shape) == 1:
+            shape = shape[:-1]  # Removing the column axis of the vector
+        if len(self.shape) == 1:
+            shape = shape[:-1] if len(other.shape) == 1 else shape[:-2] + shape[-1:]
+        if len(shape) == 0:
+            return new_values[0]
+
+        dtype = _promote_types(self.dtype, other.dtype)
+        buffer = _make_buffer(dtype, new_values)
+        return Array._from_buffer(shape, dtype, buffer)
+
+    def _elementwise_inplace(self, other, operation):
+        """Applies a binary operation element-wise and stores the result in this array.
+
+        `other` is broadcast to the shape of this array and the result is written back into the
+        existing buffer, so no new array is allocated.
+
+        Args:
+            other (Array, float, int): The right operand.
+            operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+
+        Returns:
+            Array: This array, or NotImplemented if the operands are not supported.
+
+        Raises:
+            ValueError: If `other` can not be broadcast to the shape of this array.
+            TypeError: If the result can not be stored with the datatype of this array,
+                i.e. an integer array combined with floats.
+            OverflowError: If an integer result is out of the range of the dtype of this array.
+        """
+        if self.datatype == bool:
+            return NotImplemented
+
+        if isinstance(other, Array):
+            if other.datatype == bool:
+                return NotImplemented
+            try:
+                shape = _broadcast_shapes(self.shape, other.shape)
+            except ValueError:
+                shape = None
+            if shape != self.shape:
+                raise ValueError(
+                    f"Array of shape {other.shape} can not be broadcast to the shape {self.shape} of the in-place result."
+                )
+            other_values = other._broadcast_to(shape)._iter_values()
+            if other._buffer is self._buffer:
+                other_values = list(
+                    other_values
+                )  # Reading all values before writing, in case the two arrays overlap
+            other_datatype = other.datatype
+        elif isinstance(other, (int, float)) and not isinstance(other, bool):
+            other_values = itertools.repeat(other)
+            other_datatype = type(other)
+        else:
+            return NotImplemented
+
+        if self.datatype == int and other_datatype == float:
+            raise TypeError(
+                "Can not store the float result of an in-place operation in an array of datatype int."
+            )
+
+        self._assign(map(operation, self._iter_values(), other_values))
+        return self
+
+    def __iadd__(self, other):
+        """Element-wise adds an Array or number to this Array in-place.
+
+        Args:
+            other (Array, float, int): The array or number to add element-wise to this array.
+
+        Returns:
+            Array: this array, holding the sum.
+
+        """
+        return self._elementwise_inplace(other, operator.add)
+
+    def __isub__(self, other):
+        """Element-wise subtracts an Array or number from this Array in-place.
+
+        Args:
+            other (Array, float, int): The array or number to subtract element-wise from this array.
+
+        Returns:
+            Array: this array, holding the difference.
+
+        """
+        return self._elementwise_inplace(other, operator.sub)
+
+    def __imul__(self, other):
+        """Element-wise multiplies this Array with an Array or number in-place.
+
+        Args:
+            other (Array, float, int): The array or number to multiply element-wise to this array.
+
+        Returns:
+            Array: this array, with every element multiplied with `other`.
+
+        """
+        return self._elementwise_inplace(other, operator.mul)
+
+    def astype(self, dtype):
+        """Returns a copy of the array with the elements converted to another dtype.
+
+        Floats are truncated towards zero when converted to integers, and numbers converted to bool
+        are True if they are non-zero.
+
+        Args:
+            dtype (str, type): The new dtype, see `__init__`.
+
+        Returns:
+            Array: A new array with the converted elements.
+
+        Raises:
+            TypeError: If the dtype is not supported.
+            OverflowError: If an element is out of the range of the new dtype.
+        """
+        dtype = _dtype_name(dtype)
+        new_values = self._iter_values()
+        if self.datatype == float and _DTYPES[dtype][1] == int:
+            new_values = map(int, new_values)
+        return Array._from_buffer(self.shape, dtype, _make_buffer(dtype, new_values))
+
+    def lazy(self):
+        """Returns a lazily evaluated version of this array.
+
+        Arithmetic on the returned LazyArray builds an expression instead of computing intermediate arrays,
+        e.g. `(a.lazy() * b + c - d).evaluate()` computes the result in a single pass over the elements.
+
+        Returns:
+            LazyArray: Expression consisting of only this array.
+        """
+        return LazyArray(self)
+
+    def __eq__(self, other):
+        """Compares an Array with another Array.
+
+        If the two array shapes do not match, it should return False.
+        If `other` is an unexpected type, return False.
+
+        Args:
+            other (Array): The array to compare with this array.
+
+        The elements are compared in order and the comparison stops at the first mismatch.
+
+        Returns:
+            bool: True if the two arrays are equal (identical). False otherwise.
+
+        """
+        if not isinstance(other, (Array, float, int, bool)):
+            return False
+        else:
+            if isinstance(other, Array):
+                if self.datatype != other.datatype:
+                    return False
+                elif self.shape != other.shape:
+                    return False
+                other_values = other._iter_values()
+            else:
+                other_values = itertools.repeat(other)
+
+            # Stops at the first element which differs
+            return all(map(operator.eq, self._iter_values(), other_values))
+
+    def is_equal(self, other):
+        """Compares an Array element-wise with another Array or number.
+
+        If `other` is an array and the two array shapes do not match, this method should raise ValueError.
+        If `other` is not an array or a number, it should return TypeError.
+
+        Args:
+            other (Array, float, int): The array or number to compare with this array.
+
+        Returns:
+            Array: An array of booleans with True where the two arrays match and False where they do not.
+                   Or if `other` is a number, it returns True where the array is equal to the number and False
+                   where it is not.
+
+        Raises:
+            ValueError: if the shape of self and other are not equal.
+
+        """
+        if not isinstance(other, (Array, float, int, bool)):
+            raise TypeError(f"Cannot compare Array with object of type {type(other)}.")
+        else:
+            if isinstance(other, Array):
+                if self.shape != other.shape:
+                    raise ValueError(
+                        "To compare two objects of type Array their shapes must match."
+                    )
+                other_values = other._iter_values()
+            else:
+                other_values = itertools.repeat(other)
+
+            buffer = self._parallel_elementwise(other, operator.eq, "bool")
+            if buffer is None:
+                buffer = _make_buffer(
+                    "bool", map(operator.eq, self._iter_values(), other_values)
+                )
+            return Array._from_buffer(self.shape, "bool", buffer)
+
+    def allclose(self, other, rtol=1e-05, atol=1e-08):
+        """Checks if all elements are equal to another Array or number within a tolerance.
+
+        Two elements `a` and `b` are close if `abs(a - b) <= atol + rtol * abs(b)`, like in `numpy.allclose`.
+        Arrays of different shapes are broadcast against each other, and the comparison stops at the
+        first element which is not close.
+
+        Args:
+            other (Array, float, int): The array or number to compare with this array.
+            rtol (float): The relative tolerance.
+            atol (float): The absolute tolerance.
+
+        Returns:
+            bool: True if all elements are close. False otherwise.
+
+        Raises:
+            TypeError: If `other` is not an array or a number.
+            ValueError: If the shapes of self and other can not be broadcast together.
+        """
+        if isinstance(other, Array):
+            shape = _broadcast_shapes(self.shape, other.shape)
+            own_values = self._broadcast_to(shape)._iter_values()
+            other_values = other._broadcast_to(shape)._iter_values()
+        elif isinstance(other, (float, int, bool)):
+            own_values = self._iter_values()
+            other_values = itertools.repeat(other)
+        else:
+            raise TypeError(f"Cannot compare Array with object of type {type(other)}.")
+
+        def is_close(value, other_value):
+            # Equal infinities are close although their difference is not a number
+            return value == other_value or abs(
+                value - other_value
+            ) <= atol + rtol * abs(other_value)
+
+        return all(map(is_close, own_values, other_values))
+
+    def _parallel_reduce(self, reduction):
+        """Reduces all elements on the process pool, see `set_parallel`.
+
+        Every worker reduces a chunk of the elements, and the results of the chunks are reduced here.
+
+        Args:
+            reduction (callable): The reduction, see `_reduce`.
+
+        Returns:
+            The reduced value, or None if the elements are reduced in this process, since the array is small
+            or not contiguous, or the reduction can not be computed from chunks.
+        """
+        workers = _parallel_workers(self.num_values)
+        buffer = self._flat_buffer()
+        if not workers or buffer is None or reduction not in _SPLITTABLE_REDUCTIONS:
+            return None
+
+        import parallel  # Only imported when parallel computation is enabled
+
+        partial = _sum if reduction is _mean else reduction
+        results = parallel.reduce(partial, buffer, self.datatype, workers)
+        result = partial(results, len(results), self.datatype)
+        return result / self.num_values if reduction is _mean else result
+
+    def _reduce(self, reduction, dtype, axis=None, keepdims=False, numeric=True):
+        """Reduces the array elements, either all of them or along one axis.
+
+        Reducing along an axis is done in one pass over strided rows of the buffer, without reshaping or
+        copying the array.
+
+        Args:
+            reduction (callable): Function taking an iterable of elements, their number and their datatype,
+                and returning the reduced value, e.g. `_sum`.
+            dtype (str): dtype of the array of reduced values.
+            axis (int): Axis to reduce along. If None all elements are reduced to a single value.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+            numeric (bool): If True only arrays of datatype int or float can be reduced.
+
+        Returns:
+            int, float, bool or Array: The reduced value, or an array of reduced values if reducing along an axis
+                of a multidimensional array or if `keepdims` is True.
+
+        Raises:
+            TypeError: If `numeric` is True and the array is of datatype bool.
+            ValueError: If the axis is out of bounds.
+        """
+        if numeric and self.datatype == bool:
+            raise TypeError(
+                "Can only reduce array if it is of datatype integer or float."
+            )
+
+        ndim = len(self.shape)
+        if axis is None:
+            result = self._parallel_reduce(reduction)
+            if result is None:
+                result = reduction(self._iter_values(), self.num_values, self.datatype)
+            if not keepdims:
+                return result
+            return Array._from_buffer(
+                (1,) * ndim, dtype, _make_buffer(dtype, (result,))
+            )
+
+        axis = _normalize_axis(axis, ndim)
+
+        # View with the reduced axis moved last, so every row holds the elements reduced to one value
+        length = self.shape[axis]
+        moved = self._view(
+            self.shape[:axis] + self.shape[axis + 1 :] + (length,),
+            self._strides[:axis] + self._strides[axis + 1 :] + (self._strides[axis],),
+            self._offset,
+        )
+        results = [reduction(row, length, self.datatype) for row in moved._rows()]
+
+        if keepdims:
+            shape = self.shape[:axis] + (1,) + self.shape[axis + 1 :]
+        elif ndim == 1:
+            return results[0]
+        else:
+            shape = moved.shape[:-1]
+        return Array._from_buffer(shape, dtype, _make_buffer(dtype, results))
+
+    def sum(self, axis=None, keepdims=False):
+        """Returns the sum of the array elements, over all elements or along an axis.
+
+        Floats are summed with `math.fsum`, so the result does not suffer from accumulated rounding errors.
+        Sums of integers have dtype int64, like in numpy, so they do not overflow small integer dtypes.
+
+        Args:
+            axis (int): Axis to sum along. If None all elements are summed.
+            keepdims (bool): If True the summed axes are kept with length one in the result.
+
+        Returns:
+            int, float or Array: The sum, or an array of sums when summing along an axis.
+        """
+        dtype = "int64" if self.datatype == int else self.dtype
+        return self._reduce(_sum, dtype, axis, keepdims)
+
+    def min(self, axis=None, keepdims=False):
+        """Returns the smallest element of the array, over all elements or along an axis.
+
+        Args:
+            axis (int): Axis to find the minimum along. If None the minimum of all elements is returned.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+
+        Returns:
+            int, float or Array: The minimum, or an array of minima when reducing along an axis.
+        """
+        return self._reduce(_min, self.dtype, axis, keepdims)
+
+    def max(self, axis=None, keepdims=False):
+        """Returns the largest element of the array, over all elements or along an axis.
+
+        Args:
+            axis (int): Axis to find the maximum along. If None the maximum of all elements is returned.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+
+        Returns:
+            int, float or Array: The maximum, or an array of maxima when reducing along an axis.
+        """
+        return self._reduce(_max, self.dtype, axis, keepdims)
+
+    def mean(self, axis=None, keepdims=False):
+        """Returns the mean of the array elements, over all elements or along an axis.
+
+        Args:
+            axis (int): Axis to average along. If None the mean of all elements is returned.
+            keepdims (bool): If True the averaged axes are kept with length one in the result.
+
+        Returns:
+            float or Array: The mean, or an array of means when averaging along an axis.
+        """
+        dtype = "float64" if self.datatype == int else self.dtype
+        return self._reduce(_mean, dtype, axis, keepdims)
+
+    def argmin(self, axis=None, keepdims=False):
+        """Returns the index of the smallest element of the array, over all elements or along an axis.
+
+        If the minimum occurs several times the first index is returned.
+
+        Args:
+            axis (int): Axis to find the minimum along. If None the index into the flattened array is returned.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+
+        Returns:
+            int or Array: The index, or an array of indices along `axis`.
+        """
+        return self._reduce(_argmin, "int64", axis, keepdims)
+
+    def all(self, axis=None, keepdims=False):
+        """Checks if all elements of the array are true (non-zero), over all elements or along an axis.
+
+        The check stops at the first false element.
+
+        Args:
+            axis (int): Axis to check along. If None all elements are checked.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+
+        Returns:
+            bool or Array: The result, or an array of results when checking along an axis.
+        """
+        return self._reduce(_all, "bool", axis, keepdims, numeric=False)
+
+    def any(self, axis=None, keepdims=False):
+        """Checks if any element of the array is true (non-zero), over all elements or along an axis.
+
+        The check stops at the first true element.
+
+        Args:
+            axis (int): Axis to check along. If None all elements are checked.
+            keepdims (bool): If True the reduced axes are kept with length one in the result.
+
+        Returns:
+            bool or Array: The result, or an array of results when checking along an axis.
+        """
+        return self._reduce(_any, "bool", axis, keepdims, numeric=False)
+
+    def min_element(self):
+        """Returns the smallest value of the array.
+
+        Only needs to work for type int and float (not boolean).
+
+        Returns:
+            float: The value of the smallest element in the array.
+
+        """
+        return self.min()
+
+    def mean_element(self):
+        """Returns the mean value of an array
+
+        Only needs to work for type int and float (not boolean).
+
+        Returns:
+            float: the mean value
+        """
+        return self.mean()
+
+
+class LazyArray:
+    """Element-wise arithmetic expression of Array objects, evaluated on demand.
+
+    Created with `Array.lazy()`. The arithmetic operators build an expression tree instead of computing
+    intermediate arrays. The whole expression is computed in one fused pass over the elements when
+    `evaluate()`, `__getitem__` or a reduction is called.
+    """
+
+    __slots__ = ("shape", "dtype", "_operation", "_operands")
+
+    def __init__(self, array):
+        """Wraps an Array as the leaf of an expression.
+
+        Args:
+            array (Array): The array. Its elements are read when the expression is evaluated, not copied.
+
+        Raises:
+            TypeError: If the array is of datatype bool, which does not support arithmetic.
+        """
+        if array.datatype == bool:
+            raise TypeError("Arithmetic is not supported for arrays of datatype bool.")
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self._operation = None  # Leaves have no operation
+        self._operands = (array,)
+
+    @property
+    def datatype(self):
+        """Python type of the elements of the expression, either int or float"""
+        return _DTYPES[self.dtype][1]
+
+    @staticmethod
+    def _combine(left, right, operation):
+        """Returns the expression applying a binary operation to two operands.
+
+        Args:
+            left (LazyArray, Array, float, int): The left operand.
+            right (LazyArray, Array, float, int): The right operand.
+            operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+
+        Returns:
+            LazyArray: The new expression, or NotImplemented if the operands are not supported.
+        """
+        operands = []
+        shapes = []
+        dtypes = []
+        numbers = []
+        for operand in (left, right):
+            if isinstance(operand, Array):
+                if operand.datatype == bool:
+                    return NotImplemented
+                operand = LazyArray(operand)
+            if isinstance(operand, LazyArray):
+                shapes.append(operand.shape)
+                dtypes.append(operand.dtype)
+            elif isinstance(operand, (int, float)) and not isinstance(operand, bool):
+                numbers.append(operand)
+            else:
+                return NotImplemented
+            operands.append(operand)
+
+        try:
+            shape = _broadcast_shapes(*shapes)
+        except ValueError:
+            return NotImplemented
+
+        # Same dtype as the eager result, see `Array._elementwise`
+        dtype = functools.reduce(_promote_types, dtypes)
+        for number in numbers:
+            dtype = _promote_scalar(dtype, number)
+
+        expression = LazyArray.__new__(LazyArray)
+        expression.shape = shape
+        expression.dtype = dtype
+        expression._operation = operation
+        expression._operands = tuple(operands)
+        return expression
+
+    def _source(self, leaves, constants):
+        """Returns Python source code of an expression computing one element of this expression.
+
+        Leaf elements are named `x0`, `x1`, ... and constant operands `c0`, `c1`, ...
+
+        Args:
+            leaves (dict): Maps the id of every leaf array to its argument number and the array itself.
+                Leaves of this expression which are not in it yet are added, so an array appearing
+                several times is only read once.
+            constants (dict): Maps the name of every constant operand to its value. Constants of this
+                expression are added.
+
+        Returns:
+            str: The source code.
+        """
+        if self._operation is None:
+            array = self._operands[0]
+            position, _ = leaves.setdefault(id(array), (len(leaves), array))
+            return f"x{position}"
+
+        terms = []
+        for operand in self._operands:
+            if isinstance(operand, LazyArray):
+                terms.append(operand._source(leaves, constants))
+            else:
+                name = f"c{len(constants)}"
+                constants[name] = operand
+                terms.append(name)
+        return f"({terms[0]} {_OPERATOR_SYMBOLS[self._operation]} {terms[1]})"
+
+    def _iter_values(self):
+        """Returns an iterator computing the elements of the expression in row-major order.
+
+        The expression is compiled to a single function of the leaf elements, so every element is
+        computed with one call and no intermediate arrays.
+        """
+        leaves = {}
+        constants = {}
+        source = self._source(leaves, constants)
+        arguments = ", ".join(f"x{position}" for position, _ in leaves.values())
+        compute = eval(f"lambda {arguments}: {source}", constants)
+
+        leaf_values = [
+            array._broadcast_to(self.shape)._iter_values()
+            for _, array in leaves.values()
+        ]
+        return map(compute, *leaf_values)
+
+    def _select(self, idx, shape):
+        """Returns the expression restricted to a selection of its elements.
+
+        Args:
+            idx (int, slice, tuple): Index of the selection, see `Array.__getitem__`.
+            shape (tuple): Shape of the full expression, which every leaf array is broadcast to.
+
+        Returns:
+            LazyArray, int, float: The expression of the selected elements computed from views of
+                the leaf arrays, or the value of the element if a single element is selected.
+        """
+        if self._operation is None:
+            return self._operands[0]._broadcast_to(shape)[idx]
+
+        left, right = (
+            operand._select(idx, shape) if isinstance(operand, LazyArray) else operand
+            for operand in self._operands
+        )
+        if isinstance(left, LazyArray) or isinstance(right, LazyArray):
+            return LazyArray._combine(left, right, self._operation)
+        return self._operation(left, right)
+
+    def _leaves(self):
+        """Returns an iterator over the arrays the expression is computed from"""
+        if self._operation is None:
+            return iter(self._operands)
+        return itertools.chain.from_iterable(
+            operand._leaves()
+            for operand in self._operands
+            if isinstance(operand, LazyArray)
+        )
+
+    def evaluate(self, out=None):
+        """Computes the expression in a single pass over the elements.
+
+        Args:
+            out (Array): Array to store the result in, e.g. a memory-mapped array. The result is then
+                written in blocks as it is computed, so no array of the full size is allocated.
+
+        Returns:
+            Array: A new array with the result, or `out`.
+
+        Raises:
+            ValueError: If the shape of `out` is not the shape of the expression.
+            TypeError: If the result can not be stored with the datatype of `out`.
+        """
+        if out is None:
+            buffer = _make_buffer(self.dtype, self._iter_values())
+            return Array._from_buffer(self.shape, self.dtype, buffer)
+
+        if out.shape != self.shape:
+            raise ValueError(
+                f"Can not store the result of shape {self.shape} in an array of shape {out.shape}."
+            )
+        out._check_assignable(self.datatype)
+        new_values = self._iter_values()
+        for leaf in self._leaves():
+            view = leaf._broadcast_to(self.shape)
+            if view._buffer is out._buffer and (view._offset, view._strides) != (
+                out._offset,
+                out._strides,
+            ):
+                # Reading all values before writing, since elements could be overwritten before being read
+                new_values = list(new_values)
+                break
+        out._assign(new_values)
+        return out
+
+    def __getitem__(self, idx):
+        """Returns the element or sub-array of the evaluated expression at given index
+
+        Only the selected elements are computed.
+
+        Args:
+            idx (int, slice, tuple): Index to evaluate, see `Array.__getitem__`.
+
+        Returns:
+            int, float or Array: The selected element, or a new array with the selected elements.
+        """
+        selection = self._select(idx, self.shape)
+        if isinstance(selection, LazyArray):
+            return selection.evaluate()
+        return selection
+
+    def __str__(self):
+        """Returns a nicely printable string representation of the evaluated expression."""
+        return str(self.evaluate())
+
+    def __add__(self, other):
+        """Adds an Array, LazyArray or number to the expression."""
+        return LazyArray._combine(self, other, operator.add)
+
+    def __radd__(self, other):
+        """Adds the expression to an Array or number."""
+        return LazyArray._combine(other, self, operator.add)
+
+    def __sub__(self, other):
+        """Subtracts an Array, LazyArray or number from the expression."""
+        return LazyArray._combine(self, other, operator.sub)
+
+    def __rsub__(self, other):
+        """Subtracts the expression from an Array or number."""
+        return LazyArray._combine(other, self, operator.sub)
+
+    def __mul__(self, other):
+        """Multiplies the expression with an Array, LazyArray or number."""
+        return LazyArray._combine(self, other, operator.mul)
+
+    def __rmul__(self, other):
+        """Multiplies an Array or number with the expression."""
+        return LazyArray._combine(other, self, operator.mul)
+
+    def _reduce(self, reduction, dtype, axis=None, keepdims=False):
+        """Reduces the elements of the expression, see `Array._reduce`.
+
+        Reducing all elements streams over the computed elements without storing them,
+        while reducing along an axis evaluates the expression first.
+        """
+        if axis is None and not keepdims:
+            return reduction(self._iter_values(), math.prod(self.shape), self.datatype)
+        return self.evaluate()._reduce(reduction, dtype, axis, keepdims)
+
+    def sum(self, axis=None, keepdims=False):
+        """Returns the sum of the elements of the expression, see `Array.sum`."""
+        dtype = "int64" if self.datatype == int else self.dtype
+        return self._reduce(_sum, dtype, axis, keepdims)
+
+    def min(self, axis=None, keepdims=False):
+        """Returns the smallest element of the expression, see `Array.min`."""
+        return self._reduce(_min, self.dtype, axis, keepdims)
+
+    def max(self, axis=None, keepdims=False):
+        """Returns the largest element of the expression, see `Array.max`."""
+        return self._reduce(_max, self.dtype, axis, keepdims)
+
+    def mean(self, axis=None, keepdims=False):
+        """Returns the mean of the elements of the expression, see `Array.mean`."""
+        dtype = "float64" if self.datatype == int else self.dtype
+        return self._reduce(_mean, dtype, axis, keepdims)
+
+    def argmin(self, axis=None, keepdims=False):
+        """Returns the index of the smallest element of the expression, see `Array.argmin`."""
+        return self._reduce(_argmin, "int64", axis, keepdims)
+
+    def all(self, axis=None, keepdims=False):
+        """Checks if all elements of the expression are non-zero, see `Array.all`."""
+        return self._reduce(_all, "bool", axis, keepdims)
+
+    def any(self, axis=None, keepdims=False):
+        """Checks if any element of the expression is non-zero, see `Array.any`."""
+        return self._reduce(_any, "bool", axis, keepdims)
+
+    def min_element(self):
+        """Returns the smallest value of the evaluated expression, without storing its elements.
+
+        Returns:
+            float: The value of the smallest element.
+        """
+        return self.min()
+
+    def mean_element(self):
+        """Returns the mean value of the evaluated expression, without storing its elements.
+
+        Returns:
+            float: the mean value
+        """
+        return self.mean()
@@ -0,0 +1,334 @@
+"""
+Benchmark suite for the Array class
+
+Times construction (`__init__`), addition (`__add__`), element-wise comparison (`is_equal`) and the
+reductions `min_element` and `mean_element` for a range of array sizes and dimensionalities, next to
+the same operations on flat Python lists and on numpy arrays (if numpy is installed). The peak memory
+allocated by each operation is measured with `tracemalloc`.
+
+Run as `python benchmark_array.py --output results.json`, and compare two runs to catch regressions with
+`python benchmark_array.py --compare old.json new.json`. The scaling of the parallel backend (see
+`array_class.set_parallel`) across cores is measured with `python benchmark_array.py --workers 1 2 4`.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import array_class
+from array_class import Array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only used as an optional baseline
+    np = None
+
+BENCHMARKS = ["construct", "add", "is_equal", "min_element", "mean_element"]
+
+SCALING_BENCHMARKS = ["add", "is_equal", "sum"]
+
+
+def array_operations(shape, values):
+    """Returns the benchmarked operations on Array instances
+
+    Args:
+        shape (tuple): Shape of the arrays.
+        values (list): Flat values of the arrays.
+
+    Returns:
+        dict: Callable without arguments per benchmark name.
+    """
+    a = Array(shape, *values)
+    b = Array(shape, *values[::-1])
+    return {
+        "construct": lambda: Array(shape, *values),
+        "add": lambda: a + b,
+        "is_equal": lambda: a.is_equal(b),
+        "min_element": a.min_element,
+        "mean_element": a.mean_element,
+    }
+
+
+def list_operations(shape, values):
+    """Returns the benchmarked operations on flat Python lists, see `array_operations`"""
+    a = list(values)
+    b = values[::-1]
+    return {
+        "construct": lambda: list(values),
+        "add": lambda: [x + y for x, y in zip(a, b)],
+        "is_equal": lambda: [x == y for x, y in zip(a, b)],
+        "min_element": lambda: min(a),
+        "mean_element": lambda: sum(a) / len(a),
+    }
+
+
+def numpy_operations(shape, values):
+    """Returns the benchmarked operations on numpy arrays, see `array_operations`"""
+    a = np.array(values).reshape(shape)
+    b = np.array(values[::-1]).reshape(shape)
+    return {
+        "construct": lambda: np.array(values).reshape(shape),
+        "add": lambda: a + b,
+        "is_equal": lambda: a == b,
+        "min_element": a.min,
+        "mean_element": a.mean,
+    }
+
+
+BACKENDS = {
+    "array": array_operations,
+    "list": list_operations,
+    "numpy": numpy_operations,
+}
+
+
+def measure(operation, calls=3):
+    """Measures the runtime and peak memory allocation of an operation
+
+    Args:
+        operation (callable): The operation, called without arguments.
+        calls (int): The number of calls to average the runtime over.
+
+    Returns:
+        tuple: Average runtime in seconds and peak allocated memory in bytes of one call.
+    """
+    total_time = 0
+    for _ in range(calls):
+        start_time = time.perf_counter()
+        operation()
+        total_time += time.perf_counter() - start_time
+
+    # Memory is traced in a separate call, since tracing slows down allocations
+    tracemalloc.start()
+    operation()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return total_time / calls, peak_memory
+
+
+def benchmark_shape(size, ndim):
+    """Returns the shape of an array with `ndim` axes of equal length and about `size` elements"""
+    length = max(1, round(size ** (1 / ndim)))
+    return (length,) * ndim
+
+
+def run_benchmarks(sizes, ndims, backends, calls=3):
+    """Runs all benchmarks for every combination of size, dimensionality and backend
+
+    Args:
+        sizes (list): Approximate number of elements of the arrays.
+        ndims (list): Numbers of dimensions of the arrays.
+        backends (list): Names of the backends to run, keys of `BACKENDS`.
+        calls (int): The number of calls to average the runtime over.
+
+    Returns:
+        list: One dictionary per measurement with the benchmark, backend, shape, size,
+            runtime ("time", in seconds) and peak memory ("peak_memory", in bytes).
+    """
+    results = []
+    for size in sizes:
+        for ndim in ndims:
+            shape = benchmark_shape(size, ndim)
+            num_values = 1
+            for dim in shape:
+                num_values *= dim
+            values = [float(i % 1000) for i in range(num_values)]
+
+            for backend in backends:
+                operations = BACKENDS[backend](shape, values)
+                for benchmark in BENCHMARKS:
+                    runtime, peak_memory = measure(operations[benchmark], calls)
+                    results.append(
+                        {
+                            "benchmark": benchmark,
+                            "backend": backend,
+                            "shape": list(shape),
+                            "size": num_values,
+                            "time": runtime,
+                            "peak_memory": peak_memory,
+                        }
+                    )
+                    print(
+                        f"{benchmark:>12} {backend:>6} {str(shape):>18}: {runtime:.3e}s, {peak_memory / 1024:>10.1f} KiB"
+                    )
+    return results
+
+
+def run_scaling(size, workers, calls=3):
+    """Runs the parallel scaling benchmarks for increasing numbers of worker processes
+
+    Every benchmark is first timed in this process, and then on the process pool of
+    `array_class.set_parallel` with each number of workers.
+
+    Args:
+        size (int): Number of elements of the arrays.
+        workers (list): Numbers of worker processes.
+        calls (int): The number of calls to average the runtime over.
+
+    Returns:
+        list: One dictionary per measurement with the benchmark, backend, number of workers (0 in this process),
+            shape, size, runtime ("time", in seconds) and speedup over computing in this process.
+    """
+    values = [float(i % 1000) for i in range(size)]
+    a = Array((size,), *values)
+    b = Array((size,), *values[::-1])
+    operations = {
+        "add": lambda: a + b,
+        "is_equal": lambda: a.is_equal(b),
+        "sum": a.sum,
+    }
+
+    results = []
+    try:
+        for benchmark in SCALING_BENCHMARKS:
+            for count in [0] + list(workers):
+                if count:
+                    array_class.set_parallel(threshold=1, workers=count)
+                    operations[
+                        benchmark
+                    ]()  # Starting the worker processes before timing
+                else:
+                    array_class.set_parallel(None)
+                runtime, _ = measure(operations[benchmark], calls)
+                if not count:
+                    serial_time = runtime
+                results.append(
+                    {
+                        "benchmark": benchmark,
+                        "backend": f"array-{count}" if count else "array",
+                        "workers": count,
+                        "shape": [size],
+                        "size": size,
+                        "time": runtime,
+                        "speedup": serial_time / runtime,
+                    }
+                )
+                print(
+                    f"{benchmark:>12} {count:>3} workers {size:>10}: {runtime:.3e}s, {serial_time / runtime:5.2f}x"
+                )
+    finally:
+        array_class.set_parallel(None)
+    return results
+
+
+def compare(old_results, new_results, threshold=1.1):
+    """Compares the runtimes of two benchmark runs
+
+    Prints the ratio of new and old runtime of every measurement found in both runs.
+
+    Args:
+        old_results (list): Results of the reference run, as returned by `run_benchmarks`.
+        new_results (list): Results of the run to check.
+        threshold (float): A measurement is a regression if its runtime grew by more than this factor.
+
+    Returns:
+        list: The (benchmark, backend, shape) keys of the regressed measurements.
+    """
+
+    def key(result):
+        return result["benchmark"], result["backend"], tuple(result["shape"])
+
+    old_times = {key(result): result["time"] for result in old_results}
+    regressions = []
+    for result in new_results:
+        if key(result) not in old_times:
+            continue
+        ratio = result["time"] / old_times[key(result)]
+        regressed = ratio > threshold
+        if regressed:
+            regressions.append(key(result))
+        benchmark, backend, shape = key(result)
+        print(
+            f"{benchmark:>12} {backend:>6} {str(shape):>18}: {ratio:6.2f}x{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    """Parse the command-line and run or compare benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Approximate numbers of elements of the benchmarked arrays.",
+    )
+    parser.add_argument(
+        "--ndims",
+        type=int,
+        nargs="+",
+        default=[1, 2, 3],
+        help="Numbers of dimensions of the benchmarked arrays.",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(BACKENDS),
+        default=[backend for backend in BACKENDS if backend != "numpy" or np],
+        help="Implementations to benchmark. numpy is included by default if installed.",
+    )
+    parser.add_argument(
+        "--calls", type=int, default=3, help="Number of calls to average over."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Run the parallel scaling benchmarks on the largest of --sizes for these numbers of worker processes instead.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="JSON file to save results in."
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        default=None,
+        help="Compare the runtimes in two JSON result files instead of running benchmarks.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.1,
+        help="Runtime ratio above which a comparison is reported as a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        old_path, new_path = args.compare
+        with open(old_path) as old_file, open(new_path) as new_file:
+            old_results = json.load(old_file)["results"]
+            new_results = json.load(new_file)["results"]
+        regressions = compare(old_results, new_results, args.threshold)
+        return 1 if regressions else 0
+
+    if "numpy" in args.backends and np is None:
+        parser.error("The numpy backend requires numpy to be installed.")
+
+    if args.workers:
+        results = run_scaling(max(args.sizes), args.workers, args.calls)
+    else:
+        results = run_benchmarks(args.sizes, args.ndims, args.backends, args.calls)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__ if np else None,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                output_file,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
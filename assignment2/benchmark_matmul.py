@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of Array matrix multiplication (`@`) against a naive triple loop
+
+Run as `python benchmark_matmul.py`, optionally with the matrix sizes to time, e.g.
+`python benchmark_matmul.py --sizes 32 64 128 --calls 5`
+"""
+
+import argparse
+import random
+import time
+
+from array_class import Array
+
+
+def naive_matmul(a, b):
+    """Multiplies two 2-D arrays with triple Python loops over their flat values
+
+    Args:
+        a (Array): Left hand matrix of shape (n, k).
+        b (Array): Right hand matrix of shape (k, m).
+
+    Returns:
+        Array: The matrix product of shape (n, m).
+    """
+    rows, inner = a.shape
+    columns = b.shape[1]
+    a_values = a.values_flat
+    b_values = b.values_flat
+
+    new_values = []
+    for i in range(rows):
+        for j in range(columns):
+            element = 0.0
+            for k in range(inner):
+                element += a_values[i * inner + k] * b_values[k * columns + j]
+            new_values.append(element)
+    return Array((rows, columns), *new_values)
+
+
+def time_one(function, *arguments, calls=3):
+    """Returns the average time in seconds of `calls` calls of function(*arguments)"""
+    total_time = 0
+    for _ in range(calls):
+        start_time = time.perf_counter()
+        function(*arguments)
+        total_time += time.perf_counter() - start_time
+    return total_time / calls
+
+
+def run_benchmark(sizes, calls=3):
+    """Times naive and blocked matrix multiplication of random square float matrices
+
+    Args:
+        sizes (list): Number of rows (and columns) of the matrices to time.
+        calls (int): Number of calls to average over.
+
+    Returns:
+        list: One dictionary per size with the size and the naive and blocked runtimes in seconds.
+    """
+    results = []
+    print(f"{'size':>6} {'naive [s]':>12} {'blocked [s]':>12} {'speedup':>8}")
+    for size in sizes:
+        a = Array((size, size), *[random.random() for _ in range(size * size)])
+        b = Array((size, size), *[random.random() for _ in range(size * size)])
+        assert (a @ b).allclose(naive_matmul(a, b))
+
+        naive_time = time_one(naive_matmul, a, b, calls=calls)
+        blocked_time = time_one(a.__matmul__, b, calls=calls)
+        print(
+            f"{size:>6} {naive_time:>12.4f} {blocked_time:>12.4f} {naive_time / blocked_time:>7.1f}x"
+        )
+        results.append(
+            {"size": size, "naive_time": naive_time, "blocked_time": blocked_time}
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[16, 32, 64, 128, 256],
+        help="Number of rows and columns of the square matrices to multiply.",
+    )
+    parser.add_argument(
+        "--calls", type=int, default=3, help="Number of calls to average over."
+    )
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.calls)
@@ -0,0 +1,194 @@
+"""
+Parallel element-wise operations and reductions for the Array class
+
+Large operations are split into one chunk of the flat buffer per worker, and the chunks are computed on a
+pool of worker processes. The operands and the result are exchanged through shared memory blocks, so the
+elements are never pickled. Enable it with `array_class.set_parallel`.
+"""
+
+import array
+import concurrent.futures
+import contextlib
+import itertools
+import struct
+from multiprocessing import shared_memory
+
+_executor = None  # Process pool, started by the first parallel operation
+_executor_workers = None  # Number of processes of `_executor`
+
+
+def _get_executor(workers):
+    """Returns the process pool with `workers` processes, replacing a running pool of another size"""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown()
+        _executor = concurrent.futures.ProcessPoolExecutor(workers)
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown():
+    """Stops the worker processes. A new pool is started by the next parallel operation."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _chunks(count, workers):
+    """Returns the (start, stop) element ranges of splitting `count` elements into one chunk per worker"""
+    size = max(1, -(-count // workers))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+@contextlib.contextmanager
+def _created(nbytes):
+    """Context manager creating a shared memory block of `nbytes` bytes, which is removed on exit"""
+    memory = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    try:
+        yield memory
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+@contextlib.contextmanager
+def _attached(name, typecode, start, stop):
+    """Context manager attaching to a shared memory block, giving a view of its elements start:stop
+
+    Args:
+        name (str): Name of the shared memory block.
+        typecode (str): Buffer format character of the elements.
+        start (int): Index of the first element of the view.
+        stop (int): Index after the last element of the view.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    itemsize = struct.calcsize(typecode)
+    try:
+        with memory.buf[start * itemsize : stop * itemsize] as raw, raw.cast(
+            typecode
+        ) as view:
+            yield view
+    finally:
+        memory.close()
+
+
+def _elementwise_chunk(operation, operands, result, start, stop):
+    """Computes the elements start:stop of an element-wise operation in a worker process.
+
+    Args:
+        operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+        operands (list): Every operand as (name, typecode) of its shared memory block, or as a number.
+        result (tuple): Name and typecode of the shared memory block to write the result to.
+        start (int): Index of the first element of the chunk.
+        stop (int): Index after the last element of the chunk.
+    """
+    with contextlib.ExitStack() as stack:
+        values = []
+        for operand in operands:
+            if isinstance(operand, tuple):
+                values.append(stack.enter_context(_attached(*operand, start, stop)))
+            else:
+                values.append(itertools.repeat(operand))
+        name, typecode = result
+        out = stack.enter_context(_attached(name, typecode, start, stop))
+        if typecode == "?":
+            # array.array has no boolean type, so booleans are computed as bytes
+            with out.cast("B") as raw:
+                raw[:] = array.array("B", map(bool, map(operation, *values)))
+        else:
+            out[:] = array.array(typecode, map(operation, *values))
+
+
+def _reduce_chunk(reduction, operand, datatype, start, stop):
+    """Reduces the elements start:stop of a shared memory block in a worker process.
+
+    Args:
+        reduction (callable): Function taking an iterable of elements, their number and their datatype,
+            and returning the reduced value.
+        operand (tuple): Name and typecode of the shared memory block.
+        datatype (type): Datatype of the elements.
+        start (int): Index of the first element of the chunk.
+        stop (int): Index after the last element of the chunk.
+
+    Returns:
+        The reduced value of the chunk.
+    """
+    with _attached(*operand, start, stop) as view:
+        return reduction(iter(view), stop - start, datatype)
+
+
+@contextlib.contextmanager
+def _shared(buffer):
+    """Context manager copying a flat buffer to a new shared memory block, giving its name and typecode"""
+    with _created(buffer.nbytes) as memory:
+        memory.buf[: buffer.nbytes] = buffer.cast("B")
+        yield memory.name, buffer.format
+
+
+def elementwise(operation, operands, typecode, count, workers):
+    """Computes an element-wise operation on a pool of worker processes.
+
+    Args:
+        operation (callable): Function of two elements returning the resulting element, e.g. `operator.add`.
+        operands (list): The operands, either flat buffers (memoryview) of `count` elements or numbers.
+        typecode (str): Buffer format character of the result.
+        count (int): Number of elements.
+        workers (int): Number of worker processes, which is also the number of chunks.
+
+    Returns:
+        memoryview: Flat buffer of the result, in a newly allocated `array.array`.
+    """
+    executor = _get_executor(workers)
+    storage = "B" if typecode == "?" else typecode  # Booleans are stored as bytes
+    with contextlib.ExitStack() as stack:
+        shared = [
+            (
+                stack.enter_context(_shared(operand))
+                if isinstance(operand, memoryview)
+                else operand
+            )
+            for operand in operands
+        ]
+        result = stack.enter_context(_created(count * struct.calcsize(storage)))
+        futures = [
+            executor.submit(
+                _elementwise_chunk,
+                operation,
+                shared,
+                (result.name, typecode),
+                start,
+                stop,
+            )
+            for start, stop in _chunks(count, workers)
+        ]
+        for future in futures:
+            future.result()
+
+        elements = array.array(storage)
+        with result.buf[: count * elements.itemsize] as raw:
+            elements.frombytes(raw)
+    buffer = memoryview(elements)
+    return buffer.cast("?") if typecode == "?" else buffer
+
+
+def reduce(reduction, buffer, datatype, workers):
+    """Reduces every chunk of a flat buffer on a pool of worker processes.
+
+    Args:
+        reduction (callable): Function taking an iterable of elements, their number and their datatype,
+            and returning the reduced value, e.g. `array_class._sum`.
+        buffer (memoryview): Flat buffer of the elements.
+        datatype (type): Datatype of the elements.
+        workers (int): Number of worker processes, which is also the number of chunks.
+
+    Returns:
+        list: The reduced value of every chunk, in order.
+    """
+    executor = _get_executor(workers)
+    with _shared(buffer) as operand:
+        futures = [
+            executor.submit(_reduce_chunk, reduction, operand, datatype, start, stop)
+            for start, stop in _chunks(len(buffer), workers)
+        ]
+        return [future.result() for future in futures]
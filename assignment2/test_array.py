@@ -2,7 +2,16 @@
 Tests for our array class
 """
 
-from array_class import Array
+import array
+import math
+import os
+import sys
+import tempfile
+
+import pytest
+
+import array_class
+from array_class import Array, LazyArray
 
 # 1D tests (Task 4)
 
@@ -13,6 +22,74 @@ def test_str_1d():
     assert str(my_array) == expected
 
 
+def test_storage_1d():
+    # Testing flat storage and element access (values_flat, __getitem__)
+    my_array = Array((4,), 3, 2, 1, 0)
+    assert my_array.values_flat == [3, 2, 1, 0]
+    assert my_array[0] == 3
+    assert my_array[-1] == 0
+
+    # Testing boolean elements are returned as booleans
+    my_array = Array((2,), True, False)
+    assert str(my_array) == "[True, False]"
+
+
+def test_memory_1d():
+    # Testing arrays have no instance dictionary (__slots__)
+    my_array = Array((3,), 1.0, 2.0, 3.0)
+    assert not hasattr(my_array, "__dict__")
+    with pytest.raises(AttributeError):
+        my_array.cache = my_array.values
+
+    # Testing memory accounting (nbytes, __sizeof__)
+    assert my_array.nbytes == 3 * 8
+    assert my_array[::2].nbytes == 2 * 8
+    assert Array((4,), True, False, True, False).nbytes == 4
+    assert sys.getsizeof(my_array) > my_array.nbytes
+
+
+def test_dtype_1d():
+    # Testing dtype inference and mixed values (__init__)
+    assert Array((2,), 1, 2).dtype == "int64"
+    assert Array((2,), True, False).dtype == "bool"
+    my_array = Array((3,), 1, 2.0, True)
+    assert my_array.dtype == "float64"
+    assert my_array.values == [1.0, 2.0, 1.0]
+
+    # Testing explicit dtypes with typed storage (__init__, astype)
+    my_array = Array((4,), 1, -2, 3, 127, dtype="int8")
+    assert my_array.nbytes == 4
+    assert my_array.datatype == int
+    assert Array((2,), 1, 2, dtype=float).values == [1.0, 2.0]
+    assert Array((2,), 0.1, 2, dtype="float32")[0] == array.array("f", [0.1])[0]
+    assert Array((2,), 0, 2, dtype="bool").values == [False, True]
+    assert Array((2,), 1.7, -1.7).astype("int16").values == [1, -1]
+
+    # Testing numpy type promotion (__add__, __mul__)
+    small = Array((2,), 1, 2, dtype="int8")
+    assert (small + Array((2,), 1, 2, dtype="int32")).dtype == "int32"
+    assert (small * 2).dtype == "int8"
+    assert (small * 2.0).dtype == "float64"
+    assert (small + Array((2,), 1.0, 2.0, dtype="float32")).dtype == "float32"
+    assert (
+        Array((1,), 1, dtype="int32") + Array((1,), 1.0, dtype="float32")
+    ).dtype == "float64"
+    assert (small.lazy() + 0.5).evaluate().dtype == "float64"
+    assert small.sum() == 3 and small.sum(keepdims=True).dtype == "int64"
+
+    # Testing unsupported dtypes and values out of range
+    with pytest.raises(TypeError):
+        Array((1,), 1, dtype="uint8")
+    with pytest.raises(TypeError):
+        Array((1,), 1.5, dtype="int32")
+    with pytest.raises(OverflowError):
+        Array((1,), 128, dtype="int8")
+    with pytest.raises(OverflowError):
+        small * 100
+    with pytest.raises(OverflowError):
+        small[::-1] += 127
+
+
 def test_add_1d():
     # Testing two integer arrays (__add__)
     my_array = Array((4,), 3, 2, 1, 0)
@@ -196,6 +273,39 @@ def test_same_1d():
     assert result == expected
 
 
+def test_all_any_1d():
+    # Testing all and any of bool and integer arrays (all, any)
+    assert Array((3,), True, True, True).all()
+    assert not Array((3,), True, False, True).all()
+    assert Array((3,), False, False, True).any()
+    assert not Array((3,), 0, 0, 0).any()
+    assert Array((2, 2), True, False, True, True).all(axis=0).values == [True, False]
+    assert Array((2, 2), True, False, False, False).any(axis=1).values == [True, False]
+
+    # Testing equality stops at the first mismatch (__eq__)
+    my_array = Array((4,), 3, 2, 1, 0)
+    another_array = Array((4,), 9, 2, 1, 0)
+    assert not my_array == another_array
+    assert my_array == my_array[::1]
+
+
+def test_allclose_1d():
+    # Testing comparison within tolerances (allclose)
+    my_array = Array((3,), 1.0, 2.0, 3.0)
+    assert my_array.allclose(Array((3,), 1.0, 2.0 + 1e-9, 3.0))
+    assert not my_array.allclose(Array((3,), 1.0, 2.1, 3.0))
+    assert my_array.allclose(Array((3,), 1.0, 2.1, 3.0), atol=0.2)
+    assert my_array.allclose(Array((3,), 1.1, 2.2, 3.3), rtol=0.1)
+    assert Array((2,), 1.0, float("inf")).allclose(Array((2,), 1.0, float("inf")))
+    assert Array((2, 2), 2, 2, 2, 2).allclose(2.0)
+    assert Array((2, 3), *[1.0] * 6).allclose(Array((3,), 1.0, 1.0, 1.0))
+
+    with pytest.raises(ValueError):
+        my_array.allclose(Array((2,), 1.0, 2.0))
+    with pytest.raises(TypeError):
+        my_array.allclose("1.0")
+
+
 def test_smallest_1d():
     # Testing one float array(min_element)
     my_array = Array((4,), 3.0, -2.0, 1.0, 0.0)
@@ -223,10 +333,66 @@ def test_mean_1d():
     result = my_array.mean_element()
     assert result == expected
 
+    # Testing an empty array, whose mean is nan like in numpy (mean_element)
+    assert math.isnan(Array((0,)).mean_element())
+
 
 # 2D tests (Task 6)
 
 
+def test_storage_2d():
+    # Testing nested values and row access of a (2, 3) integer array (__getitem__)
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    assert my_array.values == [[1, 2, 3], [4, 5, 6]]
+    assert my_array.values_flat == [1, 2, 3, 4, 5, 6]
+    assert my_array[1][2] == 6
+    assert str(my_array) == "[[1, 2, 3], [4, 5, 6]]"
+
+
+def test_indexing_2d():
+    # Testing element, row and slice access of a (3, 4) integer array (__getitem__)
+    my_array = Array((3, 4), *range(12))
+    assert my_array[1, 2] == 6
+    assert my_array[-1, -1] == 11
+    assert my_array[1].values == [4, 5, 6, 7]
+    assert my_array[:, 1].values == [1, 5, 9]
+    assert my_array[1:, ::2].values == [[4, 6], [8, 10]]
+    assert my_array[::-1, ::-2].values == [[11, 9], [7, 5], [3, 1]]
+    assert my_array[0:2][1, 3] == 7
+
+    # Testing indexing errors
+    with pytest.raises(IndexError):
+        my_array[3, 0]
+    with pytest.raises(IndexError):
+        my_array[0, 0, 0]
+    with pytest.raises(TypeError):
+        my_array[0.5]
+
+
+def test_setitem_2d():
+    # Testing assignment through an index and a view sharing the buffer (__setitem__)
+    my_array = Array((3, 4), *range(12))
+    view = my_array[1:, ::2]
+    view[0, 1] = -1
+    assert my_array[1, 2] == -1
+
+    my_array[:, 0] = 0
+    assert my_array.values == [[0, 1, 2, 3], [0, 5, -1, 7], [0, 9, 10, 11]]
+
+    my_array[0] = Array((4,), 4, 3, 2, 1)
+    assert my_array[0].values == [4, 3, 2, 1]
+
+    # Testing overlapping assignment from the same buffer
+    my_array[0, 1:] = my_array[0, :-1]
+    assert my_array[0].values == [4, 4, 3, 2]
+
+    # Testing assignment errors
+    with pytest.raises(TypeError):
+        my_array[0, 0] = 1.5
+    with pytest.raises(ValueError):
+        my_array[0] = Array((2,), 1, 2)
+
+
 def test_add_2d():
     # Testing two (2, 2) integer arrays (__add__)
     my_array = Array(
@@ -393,6 +559,104 @@ def test_mult_2d():
     assert result.values == expected
 
 
+def test_broadcast_2d():
+    # Testing an array and a scalar on the right hand side (__add__, __sub__, __mul__)
+    my_array = Array((2, 2), 3, 2, 1, 0)
+    assert (my_array + 1).values == [[4, 3], [2, 1]]
+    assert (my_array - 1.0).values == [[2.0, 1.0], [0.0, -1.0]]
+    assert (my_array * 2).values == [[6, 4], [2, 0]]
+
+    # Testing a (2, 3) array with a row (3,) and a column (2, 1) array
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    row = Array((3,), 10, 20, 30)
+    column = Array((2, 1), 100, 200)
+    assert (my_array + row).values == [[11, 22, 33], [14, 25, 36]]
+    assert (row - my_array).values == [[9, 18, 27], [6, 15, 24]]
+    assert (my_array * column).values == [[100, 200, 300], [800, 1000, 1200]]
+    assert (row + column).values == [[110, 120, 130], [210, 220, 230]]
+
+    # Testing a (2, 1, 2) array with a (3, 1) array broadcast to (2, 3, 2)
+    my_array = Array((2, 1, 2), 1.0, 2.0, 3.0, 4.0)
+    another_array = Array((3, 1), 0.0, 10.0, 20.0)
+    result = my_array + another_array
+    assert result.shape == (2, 3, 2)
+    assert result[1, 2].values == [23.0, 24.0]
+
+    # Testing broadcasting to a selection (__setitem__)
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    my_array[:] = row
+    assert my_array.values == [[10, 20, 30], [10, 20, 30]]
+
+    # Testing incompatible shapes and datatypes
+    with pytest.raises(TypeError):
+        my_array + Array((2,), 1, 2)
+    with pytest.raises(TypeError):
+        my_array + Array((3,), True, False, True)
+    with pytest.raises(TypeError):
+        my_array + True
+
+
+def test_inplace_2d():
+    # Testing in-place operators keep the same array (__iadd__, __isub__, __imul__)
+    my_array = Array((2, 2), 3.0, 2.0, 1.0, 0.0)
+    original = my_array
+    my_array += Array((2,), 1.0, 2.0)
+    my_array -= 1
+    my_array *= 2.0
+    assert my_array is original
+    assert my_array.values == [[6.0, 6.0], [2.0, 2.0]]
+
+    # Testing an in-place operation on a view changes the viewed array
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    view = my_array[:, ::2]
+    view *= 10
+    assert my_array.values == [[10, 2, 30], [40, 5, 60]]
+
+    # Testing overlapping operands
+    my_array = Array((4,), 1, 2, 3, 4)
+    my_array += my_array[::-1]
+    assert my_array.values == [5, 5, 5, 5]
+
+    # Testing results which can not be stored in-place
+    with pytest.raises(TypeError):
+        my_array += 0.5
+    with pytest.raises(ValueError):
+        my_array += Array((2, 4), *range(8))
+
+
+def test_lazy_2d():
+    # Testing a lazy expression gives the same result as eager evaluation (evaluate)
+    a = Array((2, 3), 1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+    b = Array((3,), 2.0, 0.5, 1.0)
+    c = Array((2, 1), 10.0, 20.0)
+    expression = a.lazy() * b + c - a
+    assert isinstance(expression, LazyArray)
+    assert expression.shape == (2, 3)
+    expected = a * b + c - a
+    assert expression.evaluate() == expected
+    assert str(expression) == str(expected)
+
+    # Testing the leaf arrays are read when evaluating, not when building the expression
+    expression = 2 * a.lazy() - 1
+    a[0, 0] = 0.0
+    assert expression.evaluate().values == [[-1.0, 3.0, 5.0], [7.0, 9.0, 11.0]]
+
+    # Testing selected elements are evaluated on their own (__getitem__)
+    expression = a.lazy() * a + b
+    assert expression[1, 2] == 37.0
+    assert expression[:, 0].values == [2.0, 18.0]
+
+    # Testing reductions of the expression (min_element, mean_element)
+    assert expression.min_element() == 2.0
+    assert expression.mean_element() == (a * a + b).mean_element()
+
+    # Testing unsupported operands
+    with pytest.raises(TypeError):
+        a.lazy() + Array((2,), 1.0, 2.0)
+    with pytest.raises(TypeError):
+        Array((2,), True, False).lazy()
+
+
 def test_same_2d():
     # Testing two (2, 2) integer arrays (is_equal)
     my_array = Array(
@@ -486,6 +750,268 @@ def test_same_2d():
     assert result == expected
 
 
+def test_reductions_2d():
+    # Testing reductions over all elements (sum, min, max, mean, argmin)
+    my_array = Array((2, 3), 4, 2, 7, 1, 5, 1)
+    assert my_array.sum() == 20
+    assert my_array.min() == 1
+    assert my_array.max() == 7
+    assert my_array.mean() == 20 / 6
+    assert my_array.argmin() == 3
+
+    # Testing reductions along an axis
+    assert my_array.sum(axis=0).values == [5, 7, 8]
+    assert my_array.sum(axis=1).values == [13, 7]
+    assert my_array.min(axis=-1).values == [2, 1]
+    assert my_array.max(axis=0).values == [4, 5, 7]
+    assert my_array.mean(axis=0).values == [2.5, 3.5, 4.0]
+    assert my_array.argmin(axis=1).values == [1, 0]
+    assert my_array[0].sum(axis=0) == 13
+
+    # Testing keepdims
+    assert my_array.sum(axis=1, keepdims=True).values == [[13], [7]]
+    assert my_array.max(keepdims=True).values == [[7]]
+
+    # Testing reductions of a strided view
+    assert my_array[::-1, ::2].sum(axis=0).values == [5, 8]
+    assert my_array[:, ::-1].argmin(axis=1).values == [1, 0]
+
+    # Testing float sums are not affected by accumulated rounding errors
+    my_array = Array((2, 3), 1e16, 1.0, -1e16, 0.1, 0.1, 0.1)
+    assert my_array.sum() == 1.3
+    assert my_array.sum(axis=1).values == [1.0, 0.30000000000000004]
+
+    # Testing reductions of a lazy expression
+    another_array = Array((3,), 1.0, 2.0, 3.0)
+    assert (another_array.lazy() * 2).sum() == 12.0
+    assert (my_array.lazy() * 0 + another_array).argmin(axis=1).values == [0, 0]
+
+    # Testing unsupported reductions
+    with pytest.raises(ValueError):
+        my_array.sum(axis=2)
+    with pytest.raises(TypeError):
+        Array((2,), True, False).sum()
+
+
+def test_matmul_2d():
+    # Testing matrix products of 2-D arrays (__matmul__)
+    a = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    b = Array((3, 2), 7, 8, 9, 10, 11, 12)
+    assert (a @ b).values == [[58, 64], [139, 154]]
+    assert (a @ Array((3, 1), 1.0, 0.0, -1.0)).values == [[-2.0], [-2.0]]
+
+    # Testing vectors on either side
+    vector = Array((3,), 1, 0, -1)
+    assert (a @ vector).values == [-2, -2]
+    assert (Array((2,), 1, 1) @ a).values == [5, 7, 9]
+    assert vector @ vector == 2
+
+    # Testing stacks of matrices broadcast against each other
+    stack = Array((2, 2, 3), *range(12))
+    result = stack @ b
+    assert result.shape == (2, 2, 2)
+    assert result[1].values == (stack[1] @ b).values
+
+    # Testing products spanning several tiles of strided views give the same result
+    a = Array((5, 7), *range(35))
+    b = Array((7, 3), *range(21))
+    expected = [
+        [sum(a[i, k] * b[k, j] for k in range(7)) for j in range(3)] for i in range(5)
+    ]
+    block = array_class._MATMUL_BLOCK
+    array_class._MATMUL_BLOCK = 2
+    try:
+        assert (a @ b).values == expected
+        assert (a[::-1] @ b).values == expected[::-1]
+    finally:
+        array_class._MATMUL_BLOCK = block
+
+    # Testing unsupported operands
+    with pytest.raises(ValueError):
+        a @ a
+    with pytest.raises(TypeError):
+        a @ 2
+
+
+def test_reshape_2d():
+    # Testing reshaping a contiguous array gives a view (reshape, ravel)
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    reshaped = my_array.reshape(3, 2)
+    assert reshaped.values == [[1, 2], [3, 4], [5, 6]]
+    assert my_array.reshape((-1, 1, 2)).shape == (3, 1, 2)
+    reshaped[0, 0] = 10
+    assert my_array[0, 0] == 10
+    assert my_array.ravel().values == [10, 2, 3, 4, 5, 6]
+    flat = my_array.flatten()
+    flat[0] = 1
+    assert my_array[0, 0] == 10
+
+    # Testing transposed views (transpose, T, swapaxes)
+    transposed = my_array.T
+    assert transposed.values == [[10, 4], [2, 5], [3, 6]]
+    transposed[2, 1] = 0
+    assert my_array[1, 2] == 0
+    cube = Array((2, 3, 4), *range(24))
+    assert cube.transpose(1, 2, 0)[2, 3, 1] == cube[1, 2, 3]
+    assert cube.swapaxes(0, -1).shape == (4, 3, 2)
+    assert cube.swapaxes(0, -1)[3, 1, 0] == cube[0, 1, 3]
+
+    # Testing reshaping a non-contiguous view copies its elements
+    copied = transposed.reshape(6)
+    assert copied.values == [10, 4, 2, 5, 3, 0]
+    copied[0] = 1
+    assert my_array[0, 0] == 10
+
+    # Testing invalid shapes and axes
+    with pytest.raises(ValueError):
+        my_array.reshape(4, 2)
+    with pytest.raises(ValueError):
+        my_array.reshape(-1, -1)
+    with pytest.raises(ValueError):
+        cube.transpose(0, 0, 1)
+    with pytest.raises(ValueError):
+        cube.swapaxes(0, 3)
+
+
+def test_buffer_2d():
+    # Testing an Array sharing the memory of an array.array (from_buffer)
+    values = array.array("d", [1.0, 2.0, 3.0, 4.0])
+    my_array = Array.from_buffer(values, (2, 2))
+    assert my_array.values == [[1.0, 2.0], [3.0, 4.0]]
+    my_array[1, 1] = 0.0
+    assert values[3] == 0.0
+
+    # Testing a memoryview sharing the memory of an Array (to_memoryview)
+    view = my_array.to_memoryview()
+    assert view.shape == (2, 2)
+    assert view.tolist() == [[1.0, 2.0], [3.0, 0.0]]
+    view[0, 0] = -1.0
+    assert my_array[0, 0] == -1.0
+
+    # Testing buffers of smaller dtypes keep their dtype
+    assert Array.from_buffer(array.array("f", [1.5])).dtype == "float32"
+    assert Array.from_buffer(array.array("b", [1, -2])).values == [1, -2]
+
+    # Testing unsupported buffers
+    with pytest.raises(TypeError):
+        Array.from_buffer(array.array("I", [1]))
+    with pytest.raises(ValueError):
+        Array.from_buffer(values, (3,))
+    with pytest.raises(BufferError):
+        my_array[:, 0].to_memoryview()
+
+
+def test_file_2d():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "array.bin")
+
+        # Testing a memory-mapped array writes through to its file (memmap, flush)
+        my_array = Array.memmap(path, "int16", (2, 3), mode="w+")
+        my_array[:] = Array((3,), 1, 2, 3)
+        my_array *= 2
+        my_array.flush()
+        assert os.path.getsize(path) == 12
+        assert Array.memmap(path, "int16", mode="r").values_flat == [2, 4, 6] * 2
+
+        # Testing reductions and evaluating expressions into a memory-mapped array (evaluate)
+        my_array = Array.memmap(path, "int16", (2, 3))
+        assert my_array.sum(axis=0).values == [4, 8, 12]
+        result = (my_array.lazy() * 2 - my_array[0]).evaluate(out=my_array)
+        assert result is my_array
+        assert my_array.values == [[2, 4, 6], [2, 4, 6]]
+        (my_array.lazy() + my_array[::-1, ::-1]).evaluate(out=my_array)
+        assert my_array.values == [[8, 8, 8], [8, 8, 8]]
+        copied = Array.memmap(path, "int16", (2, 3), mode="c")
+        copied[0, 0] = 0
+        assert my_array[0, 0] == 8
+
+        # Testing saving and loading, also memory-mapped (save, load)
+        path = os.path.join(directory, "saved.array")
+        transposed = Array((2, 3), 1.5, 2.5, 3.5, 4.5, 5.5, 6.5).T
+        transposed.save(path)
+        loaded = Array.load(path)
+        assert loaded.dtype == "float64"
+        assert loaded.values == transposed.values
+        loaded = Array.load(path, mmap_mode="r+")
+        loaded[0, 0] = 0.0
+        loaded.flush()
+        assert Array.load(path)[0, 0] == 0.0
+        Array((2,), True, False).save(path)
+        assert Array.load(path).values == [True, False]
+
+        # Testing invalid files and modes
+        with pytest.raises(ValueError):
+            Array.memmap(path, "int64", (100,))
+        with pytest.raises(ValueError):
+            Array.memmap(path, "int8", mode="w")
+        with pytest.raises(ValueError):
+            (my_array.lazy() * 2).evaluate(out=Array((3,), 1, 2, 3))
+        with pytest.raises(ValueError):
+            Array.load(os.path.join(directory, "array.bin"))
+
+
+def test_parallel_2d():
+    my_array = Array((4, 25), *[float(i % 7) for i in range(100)])
+    another_array = Array((4, 25), *range(100))
+    expected = [
+        (my_array + another_array).values,
+        (2 - my_array).values,
+        my_array.is_equal(3.0).values,
+        my_array.sum(),
+        my_array.mean(),
+        another_array.max(),
+        my_array.any(),
+    ]
+
+    # Testing parallel results match results computed in this process (set_parallel)
+    array_class.set_parallel(threshold=50, workers=3)
+    try:
+        result = [
+            (my_array + another_array).values,
+            (2 - my_array).values,
+            my_array.is_equal(3.0).values,
+            my_array.sum(),
+            my_array.mean(),
+            another_array.max(),
+            my_array.any(),
+        ]
+        assert result == expected
+        assert (my_array + another_array).dtype == "float64"
+        assert my_array[:, ::2].sum() == sum(my_array[:, ::2].values_flat)
+    finally:
+        array_class.set_parallel(None)
+
+
+def test_numpy_2d():
+    np = pytest.importorskip("numpy")
+
+    # Testing numpy arrays sharing the memory of an Array (__array_interface__, __array__)
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    ndarray = np.asarray(my_array)
+    assert ndarray.dtype == np.int64
+    assert ndarray.tolist() == my_array.values
+    ndarray[0, 0] = 10
+    assert my_array[0, 0] == 10
+    assert np.asarray(my_array[::-1, 1:]).tolist() == [[5, 6], [2, 3]]
+    assert np.asarray(Array((2,), True, False)).dtype == np.bool_
+    assert my_array.__array__(dtype=np.float64).dtype == np.float64
+
+    # Testing an Array sharing the memory of a numpy array (from_numpy)
+    ndarray = np.arange(6.0).reshape(2, 3)
+    my_array = Array.from_numpy(ndarray)
+    my_array += 1.0
+    assert ndarray.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert Array.from_numpy(ndarray[:, ::2]).values == [[1.0, 3.0], [4.0, 6.0]]
+
+    # Testing numpy integers as indices (__getitem__, __setitem__)
+    my_array = Array((2, 3), 1, 2, 3, 4, 5, 6)
+    assert my_array[np.int64(1), np.int8(-1)] == 6
+    my_array[np.int32(0)] = 0
+    assert my_array.values == [[0, 0, 0], [4, 5, 6]]
+    with pytest.raises(TypeError):
+        my_array[np.bool_(True)]
+
+
 def test_mean_2d():
     # Testing one (2, 2) float array (mean_element)
     my_array = Array((4,), 3.0, -2.0, 1.0, 0.0)
@@ -509,6 +1035,9 @@ if __name__ == "__main__":
 
     # Task 4: 1d tests
     test_str_1d()
+    test_storage_1d()
+    test_memory_1d()
+    test_dtype_1d()
     test_add_1d()
     test_sub_1d()
     test_mul_1d()
@@ -516,9 +1045,24 @@ if __name__ == "__main__":
     test_mean_1d()
     test_same_1d()
     test_smallest_1d()
+    test_all_any_1d()
+    test_allclose_1d()
 
     # Task 6: 2d tests
+    test_storage_2d()
+    test_indexing_2d()
+    test_setitem_2d()
     test_add_2d()
     test_mult_2d()
+    test_broadcast_2d()
+    test_inplace_2d()
+    test_lazy_2d()
     test_same_2d()
     test_mean_2d()
+    test_reductions_2d()
+    test_matmul_2d()
+    test_reshape_2d()
+    test_buffer_2d()
+    test_file_2d()
+    test_parallel_2d()
+    test_numpy_2d()
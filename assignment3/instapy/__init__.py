@@ -1,19 +1,123 @@
 """instapy: image filters in Python"""
 
 import importlib
+import importlib.util
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# The filters provided by every implementation
+_filters = ["color2gray", "color2sepia"]
+
+# Registered implementations: the module defining their filter functions
+# (named e.g. python_color2gray) and the packages the module needs.
+# Modules are only imported when one of their filters is first requested.
+_implementations: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+
+def register_implementation(
+    implementation: str, module: str, requires: Sequence[str] = ()
+) -> None:
+    """Register an implementation of the filters
+
+    The module is not imported until one of its filters is requested with `get_filter`.
+
+    Args:
+
+        implementation (str):
+            The name of the implementation (python, cython, etc.)
+        module (str):
+            The module defining the filter functions, named e.g. `{implementation}_color2gray`
+        requires (sequence of str):
+            Packages the module needs, checked by `is_available`
+    """
+    _implementations[implementation] = (module, tuple(requires))
+    _load_filter.cache_clear()
+
+
+def list_filters() -> List[str]:
+    """Return the names of all filters"""
+    return list(_filters)
+
+
+def list_implementations(available_only: bool = False) -> List[str]:
+    """Return the names of the registered implementations
+
+    Args:
+
+        available_only (bool):
+            If True, only return the implementations which can be used (see `is_available`)
+    """
+    return [
+        implementation
+        for implementation in _implementations
+        if not available_only or is_available(implementation)
+    ]
+
+
+def is_available(implementation: str) -> bool:
+    """Check if an implementation can be used, without importing it
+
+    An implementation is available if its module and the packages it needs can be found,
+    e.g. the cython implementation is only available once its extension module is compiled.
+
+    Args:
+
+        implementation (str):
+            The name of the implementation (python, cython, etc.)
+
+    Returns:
+        available (bool):
+            True if the filters of the implementation can be loaded
+    """
+    module, requires = _implementations[_check_implementation(implementation)]
+    for name in (*requires, module):
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):  # e.g. a missing parent package
+            return False
+    return True
+
+
+def _check_implementation(implementation: str) -> str:
+    """Raise ValueError if no implementation of this name is registered"""
+    if implementation not in _implementations:
+        raise ValueError(
+            f"Unknown implementation {implementation!r}, choose one of {', '.join(_implementations)}"
+        )
+    return implementation
+
+
+@lru_cache(maxsize=None)
+def _load_filter(filter: str, implementation: str) -> Callable:
+    """Import the module of an implementation and return one of its filter functions
+
+    Cached, so every filter function is only resolved once.
+    """
+    if not is_available(implementation):
+        module, requires = _implementations[implementation]
+        raise ImportError(
+            f"The {implementation} implementation is not available: {module} or one of {requires} can not be imported"
+        )
+    module, _ = _implementations[implementation]
+    return getattr(importlib.import_module(module), f"{implementation}_{filter}")
 
 
 def get_filter(filter: str = "color2gray", implementation: str = "python"):
     """Return the filter function by name
 
-    Assumes filters are named e.g. instapy.python_filters.python_color2gray.
+    Filters are looked up in the registered implementations, e.g. instapy.python_filters.python_color2gray.
+    The module of an implementation is imported on first use, and the resolved functions are cached.
 
     Args:
 
         filter (str):
             The name of the filter ('color2gray' or 'color2sepia')
         implementation (str):
-            The name of the implementation (python, cython, etc.)
+            The name of the implementation (python, cython, etc.),
+            or 'auto' for the fastest available implementation (see instapy.auto)
 
     Returns:
         filter_function (function):
@@ -21,11 +125,76 @@ def get_filter(filter: str = "color2gray", implementation: str = "python"):
             (a 3D numpy array of uint8)
             and return the filtered image
             (numpy array of same shape and type as input)
+
+    Raises:
+        ValueError: If the filter or implementation is unknown
+        ImportError: If the implementation is not available (see `is_available`)
     """
+    if filter not in _filters:
+        raise ValueError(
+            f"Unknown filter {filter!r}, choose one of {', '.join(_filters)}"
+        )
+    return _load_filter(filter, _check_implementation(implementation))
+
+
+def _prepare_output(
+    image: np.array,
+    out: Optional[np.array],
+    inplace: bool,
+    shape: Tuple[int, ...],
+) -> Tuple[np.array, np.array]:
+    """Return the image to filter and the array to write the filtered image to
+
+    Used by the filter functions for their `out` and `inplace` arguments.
+    The filters read all colors of a pixel (or a block of rows) before writing it,
+    so the result can be written to the image itself without copying it.
+
+    Args:
+
+        image (np.array):
+            The image to filter
+        out (np.array or None):
+            The array given to write the result to, or None to allocate a new one
+        inplace (bool):
+            If True, the result is written to the image itself
+        shape (tuple of int):
+            The shape of the filtered image
+
+    Returns:
+        image, out (tuple of np.array):
+            The image, copied if writing to `out` would overwrite pixels before they are read,
+            and the uint8 array of the given shape to write to
+
+    Raises:
+        ValueError: If `out` has another shape or dtype, or is read-only
+    """
+    if inplace:
+        if out is not None:
+            raise ValueError("Use either out or inplace=True, not both")
+        out = image
+    if out is None:
+        return image, np.empty(shape, dtype=np.uint8)
+
+    if out.shape != tuple(shape) or out.dtype != np.uint8:
+        raise ValueError(
+            f"out must be a uint8 array of shape {tuple(shape)}, got {out.dtype} of shape {out.shape}"
+        )
+    if not out.flags.writeable:
+        raise ValueError("out must be writable, got a read-only array")
+    if np.may_share_memory(image, out):
+        same_pixels = (
+            out.ctypes.data == image.ctypes.data and out.strides == image.strides
+        )
+        if not same_pixels:
+            image = image.copy()
+    return image, out
+
 
-    # get the module (instapy.python_filters)
-    module = importlib.import_module(f"instapy.{implementation}_filters")
-    # construct filter function name (python_color2gray)
-    filter_name = f"{implementation}_{filter}"
-    # return the resolved function (instapy.python.python_color2gray)
-    return getattr(module, filter_name)
+register_implementation("python", "instapy.python_filters")
+register_implementation("numpy", "instapy.numpy_filters", requires=["numpy"])
+register_implementation("numba", "instapy.numba_filters", requires=["numba"])
+# Multithreaded variants of the numba filters
+register_implementation("numba_parallel", "instapy.numba_filters", requires=["numba"])
+register_implementation("cython", "instapy.cython_filters")
+# Dispatches to the fastest of the above, see instapy.auto
+register_implementation("auto", "instapy.auto")
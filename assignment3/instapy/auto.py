@@ -0,0 +1,143 @@
+"""Automatic selection of the fastest available filter implementation
+
+`instapy.get_filter(filter, "auto")` returns the filters of this module.
+The first time an image of a size class is filtered, every available
+implementation is timed on it, and the fastest one is used for all
+images of that size class from then on.
+The selections are saved in a cache file, so the calibration only runs
+once per machine.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+import instapy
+from . import timing
+
+# Implementations to choose from; the pure python reference is far too slow to compete
+CANDIDATES = ["cython", "numba_parallel", "numba", "numpy"]
+
+# Upper limit of the number of pixels of each image size class,
+# images with more pixels are "large"
+SIZE_CLASSES = {
+    "small": 256 * 256,
+    "medium": 1024 * 1024,
+}
+
+# The selected implementations, loaded from the cache file on first use
+_selected = None
+
+
+def cache_path() -> Path:
+    """Return the path of the file the selected implementations are saved in
+
+    Set the INSTAPY_AUTO_CACHE environment variable to use another file than
+    ~/.cache/instapy/auto.json
+    """
+    default = Path("~/.cache/instapy/auto.json").expanduser()
+    return Path(os.environ.get("INSTAPY_AUTO_CACHE", default))
+
+
+def size_class(image: np.array) -> str:
+    """Return the name of the size class of an image"""
+    pixels = image.shape[0] * image.shape[1]
+    for name, limit in SIZE_CLASSES.items():
+        if pixels <= limit:
+            return name
+    return "large"
+
+
+def _available_candidates() -> list:
+    """Return the candidate implementations which can be used on this machine"""
+    available = instapy.list_implementations(available_only=True)
+    return [
+        implementation for implementation in CANDIDATES if implementation in available
+    ]
+
+
+def _load_cache() -> Dict:
+    """Read the selected implementations from the cache file
+
+    Selections made with other implementations available (e.g. before cython was compiled)
+    are discarded.
+    """
+    try:
+        with open(cache_path()) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("candidates") != _available_candidates():
+        cache = {"candidates": _available_candidates(), "filters": {}}
+    return cache
+
+
+def _save_cache(cache: Dict) -> None:
+    """Write the selected implementations to the cache file, if it is writable"""
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as cache_file:
+            json.dump(cache, cache_file, indent=2)
+    except OSError:
+        pass  # The selections are still used for the rest of this run
+
+
+def calibrate(filter: str, image: np.array, calls: int = 1) -> str:
+    """Time every available candidate implementation of a filter and return the fastest
+
+    Args:
+        filter (str): The name of the filter ('color2gray' or 'color2sepia')
+        image (np.array): The image to time the filters with
+        calls (int): The number of calls to average the time over
+
+    Returns:
+        implementation (str): The name of the fastest implementation
+    """
+    runtimes = {}
+    for implementation in _available_candidates():
+        filter_function = instapy.get_filter(filter, implementation)
+        filter_function(image)  # The first call includes compilation (numba)
+        runtimes[implementation] = timing.time_one(filter_function, image, calls=calls)
+    return min(runtimes, key=runtimes.get)
+
+
+def select(filter: str, image: np.array) -> str:
+    """Return the implementation to filter an image with
+
+    Calibrates the filter on the image if no implementation is selected for its size class yet.
+    """
+    global _selected
+    if _selected is None:
+        _selected = _load_cache()
+    selected = _selected["filters"].setdefault(filter, {})
+    key = size_class(image)
+    if key not in selected:
+        selected[key] = calibrate(filter, image)
+        _save_cache(_selected)
+    return selected[key]
+
+
+def auto_color2gray(image: np.array, **keywords) -> np.array:
+    """Convert rgb pixel array to grayscale with the fastest implementation
+
+    Only keyword arguments (e.g. `out=`) are passed on to the selected implementation.
+    """
+    implementation = select("color2gray", image)
+    return instapy.get_filter("color2gray", implementation)(image, **keywords)
+
+
+def auto_color2sepia(image: np.array, **keywords) -> np.array:
+    """Convert rgb pixel array to sepia with the fastest implementation
+
+    Only keyword arguments (e.g. `out=`) are passed on to the selected implementation.
+    The tunable filter `k=` is only implemented with numpy, which is then used directly.
+    """
+    if "k" in keywords:
+        implementation = "numpy"
+    else:
+        implementation = select("color2sepia", image)
+    return instapy.get_filter("color2sepia", implementation)(image, **keywords)
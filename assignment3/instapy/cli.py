@@ -1,8 +1,15 @@
 """Command-line (script) interface to instapy"""
 
 import argparse
+import concurrent.futures
+import functools
 from email.mime import image
+import glob
+import multiprocessing
+import os
+from pathlib import Path
 import sys
+import time
 
 import numpy as np
 from PIL import Image
@@ -11,51 +18,250 @@ import instapy
 from instapy import timing
 from . import io
 
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 
-def run_filter(
-    file: str,
-    out_file: str = None,
-    implementation: str = "python",
-    filter: str = "color2gray",
-    scale: int = 1,
-    k: Optional[float] = 1,
-) -> None:
-    """Run the selected filter"""
-    # load the image from a file
+def load_image(file: str, scale: int = 1) -> np.array:
+    """Read an image file and downscale its height/width by `scale`"""
     image = io.read_image(file)
-    # print("raw", image)
     if scale != 1:
-        # print(image.shape)
         resized_image = Image.fromarray(
             image
         )  # Defining temporary Pillow Image to downscale
         resized_image = resized_image.resize(
             (resized_image.width // scale, resized_image.height // scale)
         )  # Downscaling image
-        # io.display(image)
         image = np.asarray(
             resized_image
         )  # Re-defining image to be the downscaled version
-        # print(image.shape)
-        # io.display(image)
-
-    # Apply the filter
-    filter_func = instapy.get_filter(filter, implementation)  # Defining filter function
-    if implementation == "numpy" and "sepia" in filter:
-        filtered = filter_func(
-            image, k
-        )  # Using optional sepia filter tuning for numpy implementation
-    else:
-        filtered = filter_func(image)
-    # print("filtered", filtered)
-    if out_file:
-        # save the file
-        io.write_image(filtered, out_file)
+    return image
+
+
+def run_pipeline(
+    file: str,
+    steps: List[Tuple[str, Optional[str]]],
+    implementation: Union[str, Dict[str, str]] = "python",
+    scale: int = 1,
+    k: Optional[float] = 1,
+    print_runtime: bool = False,
+    single_channel: bool = False,
+) -> np.array:
+    """Run several filters on one image, which is only read and downscaled once
+
+    Args:
+        file (str): The image file to filter
+        steps (list of tuple):
+            The filters to apply in order, as (filter, out_file).
+            Each filter is applied to the image read from `file`, and its result is saved to `out_file`,
+            or displayed if `out_file` is None.
+        implementation (str or dict):
+            The filter implementation to use, or a dict of the implementation to use for each filter
+        scale (int): Downscaling to apply to height/width of the image
+        k (float): Tuning of the numpy sepia filter
+        print_runtime (bool): Print the average runtime of every filter over three calls
+        single_channel (bool): Save grayscale images with a single channel ("L" mode)
+
+    Returns:
+        image (np.array):
+            The downscaled image the filters were applied to
+    """
+    image = load_image(file, scale)
+    implementations = implementation
+    for filter, out_file in steps:
+        if isinstance(implementations, dict):
+            implementation = implementations[filter]
+        filter_func = instapy.get_filter(filter, implementation)
+        if single_channel and filter == "color2gray":
+            filter_func = functools.partial(filter_func, single_channel=True)
+        arguments = [image]
+        if implementation == "numpy" and "sepia" in filter:
+            arguments.append(
+                k
+            )  # Using optional sepia filter tuning for numpy implementation
+        filtered = filter_func(*arguments)
+
+        if print_runtime:
+            runtime = timing.time_one(filter_func, *arguments, calls=3)
+            print(f"Average time of {implementation}_{filter} over 3 runs: {runtime}s")
+
+        if out_file:
+            # save the file
+            io.write_image(filtered, out_file)
+        else:
+            # not asked to save, display it instead
+            io.display(filtered)
+    return image
+
+
+def run_filter(
+    file: str,
+    out_file: str = None,
+    implementation: str = "python",
+    filter: str = "color2gray",
+    scale: int = 1,
+    k: Optional[float] = 1,
+) -> None:
+    """Run the selected filter"""
+    run_pipeline(file, [(filter, out_file)], implementation, scale, k)
+
+
+def find_images(paths: List[str]) -> List[str]:
+    """Expand directories and glob patterns to the image files they contain
+
+    Directories are searched (not recursively) for files with an image extension known to Pillow.
+    Other paths are kept as they are.
+    """
+    extensions = set(Image.registered_extensions())
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                str(child)
+                for child in sorted(Path(path).iterdir())
+                if child.is_file() and child.suffix.lower() in extensions
+            )
+        elif any(character in path for character in "*?["):
+            files.extend(sorted(glob.glob(path)))
+        else:
+            files.append(path)
+    return files
+
+
+def batch_output_file(file: str, out_dir: str, filter: str) -> str:
+    """Return the file a batch writes the filtered image to, e.g. out_dir/rain_gray.jpg for rain.jpg"""
+    path = Path(file)
+    return str(
+        Path(out_dir).joinpath(
+            f"{path.stem}_{filter.replace('color2', '')}{path.suffix}"
+        )
+    )
+
+
+def check_batch_outputs(files: List[str], out_dir: str, filters: Sequence[str]) -> None:
+    """Raise ValueError if two files of a batch would be written to the same output file
+
+    This happens for files with the same name in different directories.
+    """
+    inputs = {}
+    for file in files:
+        out_file = batch_output_file(file, out_dir, filters[0])
+        if out_file in inputs:
+            raise ValueError(
+                f"{inputs[out_file]} and {file} would both be written to {out_file}"
+            )
+        inputs[out_file] = file
+
+
+def _filter_batch_file(task: Tuple) -> int:
+    """Apply filters to one file of a batch, writing the results to the output directory
+
+    Run in the worker processes of `run_batch`.
+
+    Returns:
+        pixels (int):
+            The number of pixels of the filtered image
+    """
+    file, out_dir, implementation, filters, scale, k, single_channel = task
+    steps = [(filter, batch_output_file(file, out_dir, filter)) for filter in filters]
+    image = run_pipeline(
+        file, steps, implementation, scale, k, single_channel=single_channel
+    )
+    return image.shape[0] * image.shape[1]
+
+
+def _init_batch_worker(threads: int) -> None:
+    """Limit the number of threads of the multithreaded filters in a batch worker process
+
+    Run in every worker process of `run_batch` before it filters any file,
+    so the workers together do not start more threads than there are CPUs.
+
+    Args:
+        threads (int): The number of threads each worker may use
+    """
+    # Read by OpenMP (cython) and numba when they start their threads
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["NUMBA_NUM_THREADS"] = str(threads)
+    if "numba" in sys.modules:
+        import numba
+
+        numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+
+
+def run_batch(
+    files: List[str],
+    out_dir: str,
+    implementation: str = "python",
+    filters: Sequence[str] = ("color2gray",),
+    scale: int = 1,
+    k: Optional[float] = 1,
+    jobs: int = 1,
+    single_channel: bool = False,
+) -> Tuple[int, float, float]:
+    """Run filters on many files on a pool of worker processes
+
+    Every worker imports the filter implementation once and processes many files,
+    writing the filtered images to `out_dir` as e.g. rain_gray.jpg for the input rain.jpg.
+
+    Args:
+        files (list of str): The image files to filter
+        out_dir (str): The directory to write the filtered images to, created if needed
+        implementation (str): The filter implementation to use.
+            For 'auto' the fastest implementations are selected with the first file
+        filters (list of str): The filters to apply to every file
+        scale (int): Downscaling to apply to height/width of the images
+        k (float): Tuning of the numpy sepia filter
+        jobs (int): Number of worker processes, 0 for one per CPU.
+            The multithreaded filters of every worker share the CPUs evenly with the other workers
+        single_channel (bool): Save grayscale images with a single channel ("L" mode)
+
+    Returns:
+        throughput (tuple):
+            The number of images, their megapixels and the total runtime in seconds
+
+    Raises:
+        ValueError: If two files would be written to the same output file (see `check_batch_outputs`),
+            or `jobs` is negative
+    """
+    if jobs < 0:
+        raise ValueError(f"jobs must be 0 or more, got {jobs}")
+    check_batch_outputs(files, out_dir, filters)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    if implementation == "auto":
+        from instapy import auto
+
+        # Selecting the implementations here, so the workers do not all calibrate at once
+        image = load_image(files[0], scale)
+        implementation = {filter: auto.select(filter, image) for filter in filters}
+    tasks = [
+        (file, out_dir, implementation, filters, scale, k, single_channel)
+        for file in files
+    ]
+
+    cpus = os.cpu_count() or 1
+    workers = jobs or cpus
+    start_time = time.perf_counter()
+    if workers == 1:
+        pixels = list(map(_filter_batch_file, tasks))
     else:
-        # not asked to save, display it instead
-        io.display(filtered)
+        # Forking a process which has started the threads of the numba or OpenMP filters
+        # is not safe, so the workers are started as new interpreters
+        with concurrent.futures.ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=(max(1, cpus // workers),),
+        ) as executor:
+            # Several files per task, to reduce the communication with the workers
+            chunksize = max(1, len(tasks) // (4 * workers))
+            pixels = list(executor.map(_filter_batch_file, tasks, chunksize=chunksize))
+    runtime = time.perf_counter() - start_time
+
+    megapixels = sum(pixels) / 1e6
+    print(
+        f"Filtered {len(files)} images ({megapixels:.1f} MP) in {runtime:.2f}s: "
+        f"{len(files) / runtime:.1f} images/s, {megapixels / runtime:.1f} MP/s"
+    )
+    return len(files), megapixels, runtime
 
 
 def main(argv=None):
@@ -63,10 +269,16 @@ def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
 
-    parser = argparse.ArgumentParser()
+    # arguments can be read from a file, e.g. a list of images with @images.txt
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
 
     # filename is positional and required
-    parser.add_argument("file", type=str, help="The filename to apply filter to")
+    parser.add_argument(
+        "files",
+        type=str,
+        nargs="+",
+        help="The filename to apply filter to. Several files, directories or glob patterns are filtered in batch mode.",
+    )
     parser.add_argument(
         "-o", "--out", type=str, help="The output filename", default=None
     )
@@ -77,7 +289,7 @@ def main(argv=None):
         "--implementation",
         help="Implementation of filter function, e.g. python, cython etc.",
         default="python",
-        choices=["python", "numba", "numpy", "cython"],
+        choices=instapy.list_implementations(),
         type=str,
     )
 
@@ -114,10 +326,32 @@ def main(argv=None):
         help="Print average runtime of pecified filter(s) over three calls.",
         action="store_true",
     )
+    parser.add_argument(
+        "-l",
+        "--single-channel",
+        help="Save the grayscale image with a single channel (luminance only), which is faster and gives smaller files.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-od",
+        "--output-dir",
+        help="Batch mode: directory to write the filtered images to, required for several input files.",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Batch mode: number of worker processes, 0 for one per CPU.",
+        default=1,
+        type=int,
+    )
 
     # parse arguments and call run_filter
-    args = parser.parse_args()  # Getting commandline arguments from parser object
-    filename = args.file  # Input image filename
+    args = parser.parse_args(argv)  # Getting commandline arguments from parser object
+    files = find_images(args.files)  # Input image filenames
+    if not files:
+        parser.error(f"no images found in {' '.join(args.files)}")
     out_file = args.out  # Output filename
     implementation = args.implementation  # Which filter implementation to use
     use_gray = args.gray  # Filter to apply to input image
@@ -134,44 +368,62 @@ def main(argv=None):
             "Tuning of sepia filter only implemented for Numpy implementation."
         )
 
-    arguments = []  # List to store positional arguments of filter function
-    if use_gray:  # Structuring arguments for sepia filter function
-        filter = "color2gray"
+    if args.output_dir is not None or len(files) > 1:  # Batch mode
+        if args.output_dir is None:
+            parser.error("--output-dir is required to filter several files")
         if out_file:
-            out_name = out_file.split(".")
-            out_name = out_name[0] + "_gray." + out_name[1]
-        else:
-            out_name = out_file
-        arguments.append((filename, out_name, implementation, filter, scaleing))
-
-        if print_runtime:  # Running timing of sepia filter
-            filter_func = instapy.get_filter(filter, implementation)
-            image = io.read_image(filename)
-            # time the filter
-            runtime = timing.time_one(filter_func, image, calls=3)
-            print(f"Average time of {implementation}_{filter} over 3 runs: {runtime}s")
+            parser.error(
+                "--out can not be used with --output-dir, the output files are named after the input files"
+            )
+        if print_runtime:
+            parser.error(
+                "--runtime can not be used with --output-dir, the throughput is printed instead"
+            )
+        if args.jobs < 0:
+            parser.error(f"--jobs must be 0 or more, got {args.jobs}")
+        filters = [
+            filter
+            for filter, used in (("color2gray", use_gray), ("color2sepia", use_sepia))
+            if used
+        ]
+        try:
+            check_batch_outputs(files, args.output_dir, filters)
+        except ValueError as error:
+            parser.error(f"{error}, rename one of them")
+        run_batch(
+            files,
+            args.output_dir,
+            implementation,
+            filters,
+            scaleing,
+            sepia_tuning,
+            args.jobs,
+            args.single_channel,
+        )
+        return
+    filename = files[0]  # Input image filename
 
-    if use_sepia:  # Structuring arguments for sepia filter function
-        filter = "color2sepia"
+    steps = []  # The filters to apply and their output files, in order
+    for filter, used, suffix in (
+        ("color2gray", use_gray, "_gray."),
+        ("color2sepia", use_sepia, "_sepia."),
+    ):
+        if not used:
+            continue
         if out_file:
             out_name = out_file.split(".")
-            out_name = out_name[0] + "_sepia." + out_name[1]
+            out_name = out_name[0] + suffix + out_name[1]
         else:
             out_name = out_file
-        arguments.append((filename, out_name, implementation, filter, scaleing))
-
-        if print_runtime:  # Running timing of sepia filter
-            filter_func = instapy.get_filter(filter, implementation)
-            image = io.read_image(filename)
-            # time the filter
-            runtime = timing.time_one(filter_func, image, calls=3)
-            print(f"Average time of {implementation}_{filter} over 3 runs: {runtime}s")
+        steps.append((filter, out_name))
 
-    for args in arguments:
-        if implementation == "numpy" and "sepia" in args[3]:
-            run_filter(
-                *args, sepia_tuning
-            )  # Applying filter to specified command line arguments with sepia tuning
-        else:
-            run_filter(*args)  # Applying filter to specified command line arguments
-            # for other implementations and filters than numpy_color2sepia
+    # Reading and downscaling the image once for all filters
+    run_pipeline(
+        filename,
+        steps,
+        implementation,
+        scaleing,
+        sepia_tuning,
+        print_runtime,
+        single_channel=args.single_channel,
+    )
@@ -1,101 +1,94 @@
-"""Cython implementation of filter functions"""
+# cython: boundscheck=False, wraparound=False, initializedcheck=False
+"""Cython implementation of filter functions
+
+The filters loop over typed memoryviews of the images without the GIL, and the rows of the image
+are split between threads with `prange` when the module is compiled with OpenMP (see setup.py).
+"""
 
 import numpy as np
 cimport numpy as np
+from cython.parallel cimport prange
+
+import instapy
 
-cpdef np.ndarray[np.uint8_t, ndim=3] cython_color2gray(np.ndarray[np.uint8_t, ndim=3] image):
+def cython_color2gray(image, *, bint single_channel=False, out=None, bint inplace=False):
     """Convert rgb pixel array to grayscale using typed cython code
 
     Args:
         image (np.array)
+        single_channel (bool): return a single gray channel of shape (height, width)
+            instead of the gray value in all three colors
+        out (np.array): uint8 array to write the gray image to, instead of a new array (optional)
+        inplace (bool): write the gray image to the input image
     Returns:
         np.array: gray_image
     """
-    cdef np.ndarray[np.uint8_t, ndim=3] gray_image 
-    
-    gray_image= np.zeros_like(
-        image, dtype = np.uint8
-    )  # Using zeros instead of empty to avoid empty containing uninitialized values.
-    # iterate through the pixels, and apply the grayscale transform
-    
-    cdef int num_of_rows    # Defining variables to store length of image axes
-    cdef int num_of_columns
-    cdef int num_of_colors
-
-    cdef int row            # Defining loop variables
-    cdef int column
-    cdef int in_color
-    cdef int out_color
-
-    cdef double weighted_colors # Defining variable to temporarily store weighted color value
-
-    num_of_rows = image.shape[0]    # Assigning values to defined variables
-    num_of_columns = image.shape[1]
-    num_of_colors = image.shape[2]
-
-    cdef np.ndarray[np.double_t, ndim = 1] weights
-    weights = np.array([
-        0.21,
-        0.72,
-        0.07,
-    ], dtype = np.double
-    )  # Red, Green and Blue (RGB) weights for converting color to grayscale
-
-    
-    for row in range(num_of_rows):  # Looping over input image
-        for column in range(num_of_columns):
-            for in_color in range(num_of_colors):
-                weighted_colors = weights[in_color] * image[row, column, in_color]    # Weight input colors
-                for out_color in range(num_of_colors):
-                    gray_image[row, column, out_color] += int(weighted_colors)                 # Perform weighted color sum and assign values to output image
+    image = np.asarray(image)
+    out_shape = image.shape[:2] if single_channel else image.shape
+    image, gray_array = instapy._prepare_output(image, out, inplace, out_shape)
+
+    cdef const np.uint8_t[:, :, :] pixels = image
+    # Writing to every color of a 3D view of the output
+    cdef np.uint8_t[:, :, :] gray_image = gray_array[:, :, None] if single_channel else gray_array
+
+    cdef Py_ssize_t num_of_rows = pixels.shape[0]    # Length of image axes
+    cdef Py_ssize_t num_of_columns = pixels.shape[1]
+    cdef Py_ssize_t num_of_colors = gray_image.shape[2]
+
+    cdef Py_ssize_t row            # Defining loop variables
+    cdef Py_ssize_t column
+    cdef Py_ssize_t color
 
-    return gray_image
+    cdef double luminance   # Weighted sum of the colors of a pixel
+    cdef np.uint8_t gray
 
-cpdef np.ndarray[np.uint8_t, ndim=3] cython_color2sepia(np.ndarray[np.uint8_t, ndim=3] image):
+    for row in prange(num_of_rows, nogil=True, schedule="static"):  # Rows are filtered in parallel
+        for column in range(num_of_columns):
+            luminance = (
+                0.21 * pixels[row, column, 0]
+                + 0.72 * pixels[row, column, 1]
+                + 0.07 * pixels[row, column, 2]
+            )  # Red, Green and Blue (RGB) weights for converting color to grayscale
+            gray = <np.uint8_t> min(luminance, 255.0)
+            for color in range(num_of_colors):
+                gray_image[row, column, color] = gray
+
+    return gray_array
+
+def cython_color2sepia(image, *, out=None, bint inplace=False):
     """Convert rgb pixel array to sepia using typed cython code
 
     Args:
         image (np.array)
+        out (np.array): uint8 array to write the sepia image to, instead of a new array (optional)
+        inplace (bool): write the sepia image to the input image
     Returns:
         np.array: sepia_image
     """
-    cdef np.ndarray[np.double_t, ndim=3] sepia_image    # Making sure to use double dtype to avoid overflow
-                                                        # in intermediate sepia filter computations
-    
-    sepia_image= np.zeros_like(
-        image, dtype = np.double
-    )  
-
-    cdef int num_of_rows    # Defining variables to store length of image axes
-    cdef int num_of_columns
-    cdef int num_of_colors 
-
-    cdef int row            # Defining loop variables
-    cdef int column
-    cdef int out_color
-    cdef int in_color
-
-    cdef double weighted_colors # Defining variable to temporarily store weighted color value
-
-    num_of_rows = image.shape[0]    # Assigning values to defined variables
-    num_of_columns = image.shape[1]
-    num_of_colors = image.shape[2]
-
-    cdef np.ndarray[np.double_t, ndim = 2] sepia_matrix
-    sepia_matrix = np.array([
-        [0.393, 0.769, 0.189],
-        [0.349, 0.686, 0.168],
-        [0.272, 0.534, 0.131],
-    ], dtype = np.double
-    )  # Sepia weight matrix
-
-    
-    for row in range(num_of_rows):  # Looping over input image
+    image = np.asarray(image)
+    image, sepia_array = instapy._prepare_output(image, out, inplace, image.shape)
+
+    cdef const np.uint8_t[:, :, :] pixels = image
+    cdef np.uint8_t[:, :, :] sepia_image = sepia_array
+
+    cdef Py_ssize_t num_of_rows = pixels.shape[0]    # Length of image axes
+    cdef Py_ssize_t num_of_columns = pixels.shape[1]
+
+    cdef Py_ssize_t row            # Defining loop variables
+    cdef Py_ssize_t column
+
+    cdef double red     # Colors of a pixel, as double to avoid overflow
+    cdef double green   # in intermediate sepia filter computations
+    cdef double blue
+
+    for row in prange(num_of_rows, nogil=True, schedule="static"):  # Rows are filtered in parallel
         for column in range(num_of_columns):
-            for out_color in range(num_of_colors):
-                weighted_colors = 0
-                for in_color in range(num_of_colors):
-                    weighted_colors += sepia_matrix[out_color, in_color] * image[row, column, in_color]    # Weight input colors
-                sepia_image[row, column, out_color] = min(255, weighted_colors)
-    
-    return sepia_image.astype("uint8")
+            red = pixels[row, column, 0]    # Reading the pixel before writing it
+            green = pixels[row, column, 1]
+            blue = pixels[row, column, 2]
+            # Sepia matrix product, cliping to the max allowed value 255
+            sepia_image[row, column, 0] = <np.uint8_t> min(0.393 * red + 0.769 * green + 0.189 * blue, 255.0)
+            sepia_image[row, column, 1] = <np.uint8_t> min(0.349 * red + 0.686 * green + 0.168 * blue, 255.0)
+            sepia_image[row, column, 2] = <np.uint8_t> min(0.272 * red + 0.534 * green + 0.131 * blue, 255.0)
+
+    return sepia_array
@@ -14,7 +14,10 @@ def read_image(filename: str) -> np.array:
 
 
 def write_image(array: np.array, filename: str) -> None:
-    """Write a numpy pixel array to a file"""
+    """Write a numpy pixel array to a file
+
+    Arrays of shape (height, width) are written as single channel ("L" mode) grayscale images.
+    """
     return Image.fromarray(array).save(filename)
 
 
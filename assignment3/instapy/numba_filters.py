@@ -1,21 +1,20 @@
 """numba-optimized filters"""
-from numba import jit
+from typing import Optional
+
+from numba import jit, prange
 import numpy as np
 
+import instapy
+
 
 @jit(nopython=True, cache=True)
-def numba_color2gray(image: np.array) -> np.array:
-    """Convert rgb pixel array to grayscale using just-in-time compiled python code
+def _numba_color2gray(image: np.array, gray_image: np.array) -> None:
+    """Write the grayscale of an rgb pixel array to every color of gray_image
 
     Args:
         image (np.array)
-    Returns:
-        np.array: gray_image
+        gray_image (np.array): array of shape (height, width, colors), with one or three colors
     """
-    gray_image = np.zeros_like(
-        image
-    )  # Using zeros instead of empty to avoid empty containing uninitialized values.
-
     num_of_rows, num_of_columns, num_of_colors = image.shape
 
     weights = [
@@ -26,32 +25,48 @@ def numba_color2gray(image: np.array) -> np.array:
 
     for row in range(num_of_rows):  # Looping over input image
         for column in range(num_of_columns):
+            gray = 0
             for in_color in range(num_of_colors):
-                weighted_colors = (
+                gray += int(
                     weights[in_color] * image[row, column, in_color]
-                )  # Weight input colors
-                for out_color in range(num_of_colors):
-                    gray_image[row, column, out_color] += int(
-                        weighted_colors
-                    )  # Perform weighted color sum and assign values to output image
+                )  # Perform weighted color sum
+            for out_color in range(gray_image.shape[2]):
+                gray_image[row, column, out_color] = gray  # Assign to output image
+
+
+def numba_color2gray(
+    image: np.array,
+    *,
+    single_channel: bool = False,
+    out: Optional[np.array] = None,
+    inplace: bool = False,
+) -> np.array:
+    """Convert rgb pixel array to grayscale using just-in-time compiled python code
 
+    Args:
+        image (np.array)
+        single_channel (bool): return a single gray channel of shape (height, width)
+            instead of the gray value in all three colors
+        out (np.array): uint8 array to write the gray image to, instead of a new array (optional)
+        inplace (bool): write the gray image to the input image
+    Returns:
+        np.array: gray_image
+    """
+    out_shape = image.shape[:2] if single_channel else image.shape
+    image, gray_image = instapy._prepare_output(image, out, inplace, out_shape)
+    # The kernel writes to every color of a 3D array
+    _numba_color2gray(image, gray_image[:, :, None] if single_channel else gray_image)
     return gray_image
 
 
 @jit(nopython=True, cache=True)
-def numba_color2sepia(image: np.array) -> np.array:
-    """Convert rgb pixel array to sepia using just-in-time compiled python code
+def _numba_color2sepia(image: np.array, sepia_image: np.array) -> None:
+    """Write the sepia of an rgb pixel array to sepia_image
 
     Args:
         image (np.array)
-    Returns:
-        np.array: sepia_image
+        sepia_image (np.array): array of the same shape as image
     """
-    sepia_image = np.zeros(
-        image.shape, dtype=float
-    )  # Making sure dtype of initial zeros image is float
-    # to avoid overflow in intermediate calculations
-
     sepia_matrix = [
         [0.393, 0.769, 0.189],
         [0.349, 0.686, 0.168],
@@ -62,17 +77,134 @@ def numba_color2sepia(image: np.array) -> np.array:
 
     for row in range(num_of_rows):  # Looping over input image
         for column in range(num_of_columns):
+            pixel = (
+                np.float64(image[row, column, 0]),
+                np.float64(image[row, column, 1]),
+                np.float64(image[row, column, 2]),
+            )  # Reading the pixel before writing it, and using float
+            # to avoid overflow in intermediate calculations
             for out_color in range(num_of_colors):
+                weighted_colors = 0.0
                 for in_color in range(num_of_colors):
-                    weighted_colors = (
-                        sepia_matrix[out_color][in_color] * image[row, column, in_color]
+                    weighted_colors += (
+                        sepia_matrix[out_color][in_color] * pixel[in_color]
                     )  # Computing weighted color matrix product
-                    sepia_image[
-                        row, column, out_color
-                    ] += weighted_colors  # Summing weighted color values
 
                 sepia_image[row, column, out_color] = min(
-                    255, sepia_image[row, column, out_color]
+                    255.0, weighted_colors
                 )  # Cliping max value to max allowed value 255
 
-    return sepia_image.astype("uint8")  # Converting to correct dtype
+
+def numba_color2sepia(
+    image: np.array, *, out: Optional[np.array] = None, inplace: bool = False
+) -> np.array:
+    """Convert rgb pixel array to sepia using just-in-time compiled python code
+
+    Args:
+        image (np.array)
+        out (np.array): uint8 array to write the sepia image to, instead of a new array (optional)
+        inplace (bool): write the sepia image to the input image
+    Returns:
+        np.array: sepia_image
+    """
+    image, sepia_image = instapy._prepare_output(image, out, inplace, image.shape)
+    _numba_color2sepia(image, sepia_image)
+    return sepia_image
+
+
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def _numba_parallel_color2gray(image: np.array, gray_image: np.array) -> None:
+    """Write the grayscale of an rgb pixel array to every color of gray_image, using several threads
+
+    Args:
+        image (np.array)
+        gray_image (np.array): array of shape (height, width, colors), with one or three colors
+    """
+    num_of_rows, num_of_columns, _ = image.shape
+
+    for row in prange(num_of_rows):  # Rows are filtered in parallel
+        for column in range(num_of_columns):
+            luminance = (
+                0.21 * image[row, column, 0]
+                + 0.72 * image[row, column, 1]
+                + 0.07 * image[row, column, 2]
+            )  # Red, Green and Blue (RGB) weights for converting color to grayscale
+            gray = np.uint8(min(255.0, luminance))
+            for color in range(gray_image.shape[2]):
+                gray_image[row, column, color] = gray
+
+
+def numba_parallel_color2gray(
+    image: np.array,
+    *,
+    single_channel: bool = False,
+    out: Optional[np.array] = None,
+    inplace: bool = False,
+) -> np.array:
+    """Convert rgb pixel array to grayscale using multithreaded just-in-time compiled python code
+
+    The rows of the image are split between the threads (see `numba.set_num_threads`),
+    and the luminance of every pixel is computed once and written to all three channels.
+
+    Args:
+        image (np.array)
+        single_channel (bool): return a single gray channel of shape (height, width)
+            instead of the gray value in all three colors
+        out (np.array): uint8 array to write the gray image to, instead of a new array (optional)
+        inplace (bool): write the gray image to the input image
+    Returns:
+        np.array: gray_image
+    """
+    out_shape = image.shape[:2] if single_channel else image.shape
+    image, gray_image = instapy._prepare_output(image, out, inplace, out_shape)
+    # The kernel writes to every color of a 3D array
+    _numba_parallel_color2gray(
+        image, gray_image[:, :, None] if single_channel else gray_image
+    )
+    return gray_image
+
+
+@jit(nopython=True, parallel=True, fastmath=True, cache=True)
+def _numba_parallel_color2sepia(image: np.array, sepia_image: np.array) -> None:
+    """Write the sepia of an rgb pixel array to sepia_image, using several threads
+
+    Args:
+        image (np.array)
+        sepia_image (np.array): array of the same shape as image
+    """
+    num_of_rows, num_of_columns, _ = image.shape
+
+    for row in prange(num_of_rows):  # Rows are filtered in parallel
+        for column in range(num_of_columns):
+            red = np.float64(image[row, column, 0])  # Avoiding uint8 overflow
+            green = np.float64(image[row, column, 1])
+            blue = np.float64(image[row, column, 2])
+            # Sepia matrix product, cliping to the max allowed value 255
+            sepia_image[row, column, 0] = np.uint8(
+                min(255.0, 0.393 * red + 0.769 * green + 0.189 * blue)
+            )
+            sepia_image[row, column, 1] = np.uint8(
+                min(255.0, 0.349 * red + 0.686 * green + 0.168 * blue)
+            )
+            sepia_image[row, column, 2] = np.uint8(
+                min(255.0, 0.272 * red + 0.534 * green + 0.131 * blue)
+            )
+
+
+def numba_parallel_color2sepia(
+    image: np.array, *, out: Optional[np.array] = None, inplace: bool = False
+) -> np.array:
+    """Convert rgb pixel array to sepia using multithreaded just-in-time compiled python code
+
+    The rows of the image are split between the threads (see `numba.set_num_threads`).
+
+    Args:
+        image (np.array)
+        out (np.array): uint8 array to write the sepia image to, instead of a new array (optional)
+        inplace (bool): write the sepia image to the input image
+    Returns:
+        np.array: sepia_image
+    """
+    image, sepia_image = instapy._prepare_output(image, out, inplace, image.shape)
+    _numba_parallel_color2sepia(image, sepia_image)
+    return sepia_image
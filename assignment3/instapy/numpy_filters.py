@@ -3,39 +3,85 @@
 from typing import Optional
 import numpy as np
 
+import instapy
 
-def numpy_color2gray(image: np.array) -> np.array:
+# Number of pixels filtered at once, so the integer temporaries stay small
+BLOCK_PIXELS = 2**16
+
+
+def _block_rows(image: np.array) -> int:
+    """Return the number of image rows in a block of about BLOCK_PIXELS pixels"""
+    return max(1, min(image.shape[0], BLOCK_PIXELS // max(1, image.shape[1])))
+
+
+def numpy_color2gray(
+    image: np.array,
+    *,
+    single_channel: bool = False,
+    out: Optional[np.array] = None,
+    inplace: bool = False,
+) -> np.array:
     """Convert rgb pixel array to grayscale using numpy
 
+    Computed in fixed-point integer arithmetic, so no float image is allocated:
+    the weights are scaled by 256, summed in uint16 and divided by 256 with a shift.
+    The image is filtered in blocks of rows, reusing two small uint16 temporaries.
+
     Args:
         image (np.array)
+        single_channel (bool): return a single gray channel of shape (height, width)
+            instead of the gray value in all three colors
+        out (np.array): uint8 array to write the gray image to, instead of a new array (optional)
+        inplace (bool): write the gray image to the input image
     Returns:
         np.array: gray_image
     """
-
-    weights = np.array(
-        [
-            0.21,
-            0.72,
-            0.07,
-        ]
-    )  # Red, Green and Blue (RGB) weights for converting color to grayscale
-
-    weights = (
-        np.ones((3, 3)) * weights[:, None]
-    )  # Broadcasting weight copies to output RGB rows
-    # to construct transformation matrix operator
-    gray_image = image.dot(weights)  # Performing color-to-grayscale operation
-
-    return gray_image.astype("uint8")
-
-
-def numpy_color2sepia(image: np.array, k: Optional[float] = 1) -> np.array:
+    out_shape = image.shape[:2] if single_channel else image.shape
+    image, gray_image = instapy._prepare_output(image, out, inplace, out_shape)
+
+    weights = [
+        54,
+        184,
+        18,
+    ]  # Red, Green and Blue (RGB) weights 0.21, 0.72, 0.07 times 256, summing to 256
+
+    rows = _block_rows(image)
+    gray_block = np.empty((rows, image.shape[1]), dtype=np.uint16)  # At most 255 * 256
+    weighted_colors_block = np.empty_like(gray_block)
+    for start in range(0, image.shape[0], rows):
+        block = image[start : start + rows]
+        gray = gray_block[: len(block)]
+        weighted_colors = weighted_colors_block[: len(block)]
+        np.multiply(block[:, :, 0], weights[0], out=gray, dtype=np.uint16)
+        for color in (1, 2):
+            np.multiply(
+                block[:, :, color], weights[color], out=weighted_colors, dtype=np.uint16
+            )
+            gray += weighted_colors  # Weighted color sum
+        gray >>= 8  # Dividing by 256
+
+        if single_channel:
+            gray_image[start : start + rows] = gray
+        else:
+            # Broadcasting gray to all output colors
+            gray_image[start : start + rows] = gray[:, :, None]
+    return gray_image
+
+
+def numpy_color2sepia(
+    image: np.array,
+    k: Optional[float] = 1,
+    *,
+    out: Optional[np.array] = None,
+    inplace: bool = False,
+) -> np.array:
     """Convert rgb pixel array to sepia using numpy
 
     Args:
         image (np.array)
         k (float): amount of sepia filter to apply (optional)
+        out (np.array): uint8 array to write the sepia image to, instead of a new array (optional)
+        inplace (bool): write the sepia image to the input image
 
     The amount of sepia is given as a fraction, k=0 yields no sepia while
     k=1 yields full sepia.
@@ -69,14 +115,43 @@ def numpy_color2sepia(image: np.array, k: Optional[float] = 1) -> np.array:
         np.fill_diagonal(tuning_matrix, tuning_matrix_diagonal)
         sepia_matrix -= tuning_matrix
 
-    # Apply the matrix filter
-    sepia_image = image.dot(
-        sepia_matrix.T
-    )  # Performing matrix product between image and sepia matrix
-
-    # Check which entries have a value greater than 255 and set it to 255 since we can not display values bigger than 255
-    sepia_image = np.minimum(
-        sepia_image, 255
-    )  # Clipping max value of sepia image to 255.
-
-    return sepia_image.astype("uint8")
+    # Apply the matrix filter in fixed-point integer arithmetic, with the weights scaled by 4096
+    weights = np.round(sepia_matrix * 4096).astype(np.uint32)
+    # The image is filtered in blocks of rows, reusing small temporaries
+    image, sepia_image = instapy._prepare_output(image, out, inplace, image.shape)
+    rows = _block_rows(image)
+    weighted_sum_block = np.empty(
+        (rows, image.shape[1]), dtype=np.uint32
+    )  # uint32 since the sum can exceed 255 * 4096
+    weighted_colors_block = np.empty_like(weighted_sum_block)
+    # Each color is written before the next is computed from all input colors,
+    # so the blocks of an image which is also the output are copied first
+    overlaps = np.may_share_memory(image, sepia_image)
+    if overlaps:
+        image_block = np.empty((rows,) + image.shape[1:], dtype=np.uint8)
+    for start in range(0, image.shape[0], rows):
+        block = image[start : start + rows]
+        if overlaps:
+            image_block[: len(block)] = block
+            block = image_block[: len(block)]
+        weighted_sum = weighted_sum_block[: len(block)]
+        weighted_colors = weighted_colors_block[: len(block)]
+        for out_color in range(3):
+            np.multiply(
+                block[:, :, 0], weights[out_color, 0], out=weighted_sum, dtype=np.uint32
+            )
+            for in_color in (1, 2):
+                np.multiply(
+                    block[:, :, in_color],
+                    weights[out_color, in_color],
+                    out=weighted_colors,
+                    dtype=np.uint32,
+                )
+                weighted_sum += weighted_colors
+            weighted_sum >>= 12  # Dividing by 4096
+
+            # Clipping values greater than 255 since we can not display values bigger than 255
+            np.minimum(weighted_sum, 255, out=weighted_sum)
+            sepia_image[start : start + rows, :, out_color] = weighted_sum
+
+    return sepia_image
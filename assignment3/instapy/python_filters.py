@@ -1,21 +1,42 @@
 """pure Python implementation of image filters"""
 
+from typing import Optional
+
 import numpy as np
 
+import instapy
+
 
-def python_color2gray(image: np.array) -> np.array:
+def python_color2gray(
+    image: np.array,
+    *,
+    single_channel: bool = False,
+    out: Optional[np.array] = None,
+    inplace: bool = False,
+) -> np.array:
     """Convert rgb pixel array to grayscale using pure python code
 
     Args:
         image (np.array)
+        single_channel (bool): return a single gray channel of shape (height, width)
+            instead of the gray value in all three colors
+        out (np.array): uint8 array to write the gray image to, instead of a new array (optional)
+        inplace (bool): write the gray image to the input image
     Returns:
         np.array: gray_image
     """
-    gray_image = np.zeros_like(
-        image, dtype=float
-    )  # Using zeros instead of empty to avoid empty containing uninitialized values.
-    # Using float dtype to avoid overflows in intermediate computations
     num_of_rows, num_of_columns, num_of_colors = image.shape
+    if single_channel:
+        num_of_colors_out = 1
+        out_shape = (num_of_rows, num_of_columns)
+    else:
+        num_of_colors_out = num_of_colors
+        out_shape = image.shape
+    image, out = instapy._prepare_output(image, out, inplace, out_shape)
+    gray_row = np.empty(
+        (num_of_columns, num_of_colors_out), dtype=float
+    )  # Buffer for one row, reused for every row of the image.
+    # Using float dtype to avoid overflows in intermediate computations
 
     weights = [
         0.21,
@@ -24,28 +45,37 @@ def python_color2gray(image: np.array) -> np.array:
     ]  # Red, Green and Blue (RGB) weights for converting color to grayscale
 
     for row in range(num_of_rows):  # Looping over input image
+        gray_row[...] = 0  # Resetting the sums of the previous row
         for column in range(num_of_columns):
             for in_color in range(num_of_colors):
                 weighted_colors = (
                     weights[in_color] * image[row, column, in_color]
                 )  # Weight input colors
-                for out_color in range(num_of_colors):
-                    gray_image[
-                        row, column, out_color
-                    ] += weighted_colors  # Perform weighted color sum and assign values to output image
+                for out_color in range(num_of_colors_out):
+                    gray_row[
+                        column, out_color
+                    ] += weighted_colors  # Perform weighted color sum and assign values to output row
 
-    return gray_image.astype("uint8")
+        if single_channel:
+            out[row] = gray_row[:, 0]  # Converting to uint8
+        else:
+            out[row] = gray_row
+    return out
 
 
-def python_color2sepia(image: np.array) -> np.array:
+def python_color2sepia(
+    image: np.array, *, out: Optional[np.array] = None, inplace: bool = False
+) -> np.array:
     """Convert rgb pixel array to sepia using pure python code
 
     Args:
         image (np.array)
+        out (np.array): uint8 array to write the sepia image to, instead of a new array (optional)
+        inplace (bool): write the sepia image to the input image
     Returns:
         np.array: sepia_image
     """
-    sepia_image = np.zeros(image.shape, dtype=float)  # Sepia image buffer
+    image, out = instapy._prepare_output(image, out, inplace, image.shape)
 
     sepia_matrix = [
         [0.393, 0.769, 0.189],
@@ -54,6 +84,9 @@ def python_color2sepia(image: np.array) -> np.array:
     ]
 
     num_of_rows, num_of_columns, num_of_colors = image.shape
+    sepia_row = np.empty(
+        (num_of_columns, num_of_colors), dtype=float
+    )  # Buffer for one row, reused for every row of the image
 
     for row in range(num_of_rows):  # Looping over input image
         for column in range(num_of_columns):
@@ -64,8 +97,9 @@ def python_color2sepia(image: np.array) -> np.array:
                         sepia_matrix[out_color][in_color] * image[row, column, in_color]
                     )  # Computing weighted color matrix product
 
-                sepia_image[row, column, out_color] = min(
+                sepia_row[column, out_color] = min(
                     255, weighted_colors
                 )  # Cliping max value to max allowed value 255
 
-    return sepia_image.astype("uint8")  # Converting to correct dtype
+        out[row] = sepia_row  # Converting to correct dtype
+    return out
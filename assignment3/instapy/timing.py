@@ -6,9 +6,10 @@ Can be executed as `python3 -m instapy.timing`
 For Task 6.
 """
 import time
+import tracemalloc
 import instapy
 from . import io
-from typing import Callable
+from typing import Callable, Dict
 import numpy as np
 
 
@@ -45,6 +46,68 @@ def time_one(filter_function: Callable, *arguments, calls: int = 3) -> float:
     return average_runtime
 
 
+def peak_memory(filter_function: Callable, *arguments) -> int:
+    """Return the peak memory allocated during one call
+
+    Measured with tracemalloc, which traces the allocations of python objects and numpy arrays,
+    but not memory allocated by compiled code itself (e.g. arrays created inside numba functions).
+
+    Args:
+        filter_function (callable):
+            The filter function to measure
+        *arguments:
+            Arguments to pass to filter_function
+    Returns:
+        peak_memory (int):
+            The peak traced memory (in bytes) while running filter_function(*arguments)
+    """
+    tracemalloc.start()
+    try:
+        filter_function(*arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def time_threads(
+    filter_function: Callable, *arguments, calls: int = 3
+) -> Dict[int, float]:
+    """Return the time for one call of a multithreaded numba function for a range of thread counts
+
+    Times the function with 1, 2, 4, ... threads, up to the number of threads numba can use.
+
+    Args:
+        filter_function (callable):
+            The numba filter function to time, compiled with parallel=True
+        *arguments:
+            Arguments to pass to filter_function
+        calls (int):
+            The number of times to call the function,
+            for measurement
+    Returns:
+        runtimes (dict):
+            The average time (in seconds) to run filter_function(*arguments) for every thread count
+    """
+    import numba
+
+    max_threads = numba.config.NUMBA_NUM_THREADS
+    thread_counts = [2**power for power in range(max_threads.bit_length())]
+    if thread_counts[-1] != max_threads:
+        thread_counts.append(max_threads)
+
+    filter_function(*arguments)  # The first call includes compilation
+    initial_threads = numba.get_num_threads()
+    runtimes = {}
+    try:
+        for threads in thread_counts:
+            numba.set_num_threads(threads)
+            runtimes[threads] = time_one(filter_function, *arguments, calls=calls)
+    finally:
+        numba.set_num_threads(initial_threads)
+    return runtimes
+
+
 def make_reports(filename: str = "test/rain.jpg", calls: int = 3):
     """
     Make timing reports for all implementations and filters,
@@ -75,24 +138,42 @@ def make_reports(filename: str = "test/rain.jpg", calls: int = 3):
                 reference_filter, reference_implementation
             )  # Hardcoding "python" as reference implementation
             reference_time = time_one(reference_filter_func, image, calls=calls)
+            # peak memory relative to the size of the image, 1x for just the filtered image
+            memory = peak_memory(reference_filter_func, image) / image.nbytes
 
-            message = f"Reference (pure Python) filter time {reference_filter}: {reference_time:.3}s ({calls=})"
+            message = f"Reference (pure Python) filter time {reference_filter}: {reference_time:.3}s ({calls=}, {memory=:.1f}x)"
             print(message)
             report_file.write(message + "\n")
 
-            # iterate through the implementations
-            implementations = ["numpy", "numba", "cython"]
+            # iterate through the implementations which can be loaded, e.g. cython once compiled
+            implementations = [
+                implementation
+                for implementation in instapy.list_implementations(available_only=True)
+                if implementation not in (reference_implementation, "auto")
+            ]
             for implementation in implementations:
                 filter = instapy.get_filter(filter_name, implementation)
+                filter(image)  # The first call includes compilation, e.g. for numba
                 # time the filter
                 filter_time = time_one(filter, image, calls=calls)
                 # compare the reference time to the optimized time
                 speedup = reference_time / filter_time
+                memory = peak_memory(filter, image) / image.nbytes
 
-                message = f"Timing: {implementation} {filter_name}: {filter_time:.3}s ({speedup=:.2f}x)"
+                message = f"Timing: {implementation} {filter_name}: {filter_time:.3}s ({speedup=:.2f}x, {memory=:.1f}x)"
                 print(message)
                 report_file.write(message + "\n")
 
+                if implementation == "numba_parallel":
+                    # report how the multithreaded filter scales with the number of threads
+                    for threads, filter_time in time_threads(
+                        filter, image, calls=calls
+                    ).items():
+                        speedup = reference_time / filter_time
+                        message = f"Timing: {implementation} {filter_name} ({threads} threads): {filter_time:.3}s ({speedup=:.2f}x)"
+                        print(message)
+                        report_file.write(message + "\n")
+
 
 if __name__ == "__main__":
     # run as `python -m instapy.timing`
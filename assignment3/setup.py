@@ -1,14 +1,48 @@
+import os
+import sys
+
 from setuptools import setup
 
 # IN4110: set to True when you are ready for the Cython implementation in Task 5
 use_cython = True
 
+# Build with line tracing for the profilers by setting INSTAPY_PROFILE=1, e.g.
+# INSTAPY_PROFILE=1 python3 setup.py build_ext --inplace --force
+# The default release build is optimized and multithreaded instead.
+profile = os.environ.get("INSTAPY_PROFILE", "0") not in ("", "0")
+
 
 if use_cython:
     from setuptools import Extension
     import numpy as np
     from Cython.Build import cythonize
 
+    cython_directives = {
+        "language_level": 3,
+    }
+    if profile:
+        # enable profiling, which slows down the filters considerably
+        define_macros = [
+            ("CYTHON_TRACE", "1"),
+            ("CYTHON_TRACE_NOGIL", "1"),
+        ]
+        cython_directives.update(binding=True, profile=True, linetrace=True)
+        compile_args = []
+        link_args = []
+    else:
+        define_macros = []
+        # OpenMP runs the prange loops on several threads
+        if sys.platform == "win32":
+            compile_args = ["/O2", "/openmp"]
+            link_args = []
+        elif sys.platform == "darwin":
+            # Apple clang has no OpenMP, so the prange loops run on one thread
+            compile_args = ["-O3"]
+            link_args = []
+        else:
+            compile_args = ["-O3", "-fopenmp"]
+            link_args = ["-fopenmp"]
+
     extensions = [
         # A single module that is stand alone and has no special requisites
         Extension(
@@ -17,22 +51,11 @@ if use_cython:
             include_dirs=[
                 np.get_include(),
             ],
-            # enable profiling
-            define_macros=[
-                ("CYTHON_TRACE", "1"),
-                ("CYTHON_TRACE_NOGIL", "1"),
-            ],
+            define_macros=define_macros,
+            extra_compile_args=compile_args,
+            extra_link_args=link_args,
         ),
     ]
-    cython_directives = {
-        "language_level": 3,
-        # enable profiling
-        "binding": True,
-        "profile": True,
-        "linetrace": True,
-        # you may want to add some compiler directives here
-        # to optimize compilation
-    }
     ext_modules = cythonize(
         extensions,
         compiler_directives=cython_directives,
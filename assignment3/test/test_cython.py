@@ -90,3 +90,11 @@ def test_color2sepia(image, reference_sepia):
         reference_sepia, sepia_result, atol=1
     )  # Assert if cython sepia result and saved
     # pure-python reference are similar to within 1 pixel
+
+
+def test_memoryview_input(image):
+    # read-only and non-contiguous images are filtered like contiguous ones
+    view = image[:, ::-1]
+    view.flags.writeable = False
+    nt.assert_array_equal(cython_color2gray(view), cython_color2gray(view.copy()))
+    nt.assert_array_equal(cython_color2sepia(view), cython_color2sepia(view.copy()))
@@ -1,4 +1,9 @@
-from instapy.numba_filters import numba_color2gray, numba_color2sepia
+from instapy.numba_filters import (
+    numba_color2gray,
+    numba_color2sepia,
+    numba_parallel_color2gray,
+    numba_parallel_color2sepia,
+)
 
 import numpy.testing as nt
 
@@ -92,3 +97,17 @@ def test_color2sepia(image, reference_sepia):
         reference_sepia, sepia_result, atol=1
     )  # Assert if numba sepia result and saved
     # pure-python reference are similar to within 1 pixel
+
+
+def test_parallel(image, reference_gray, reference_sepia):
+    # the multithreaded filters give the same result as the serial ones
+    gray_result = numba_parallel_color2gray(image)
+    assert gray_result.dtype == np.uint8
+    assert gray_result.shape == image.shape
+    assert np.all(gray_result == gray_result[:, :, 0][:, :, None])
+    nt.assert_allclose(reference_gray, gray_result, atol=2)
+
+    sepia_result = numba_parallel_color2sepia(image)
+    assert sepia_result.dtype == np.uint8
+    assert sepia_result.shape == image.shape
+    nt.assert_allclose(reference_sepia, sepia_result, atol=1)
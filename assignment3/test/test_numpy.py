@@ -90,3 +90,16 @@ def test_color2sepia(image, reference_sepia):
         reference_sepia, sepia_result, atol=1
     )  # Assert if numpy sepia result and saved
     # pure-python reference are similar to within 1 pixel
+
+
+def test_memory(image):
+    # the fixed-point filters only allocate integer images, no float64 temporaries
+    from instapy.timing import peak_memory
+
+    assert peak_memory(numpy_color2gray, image) < 3 * image.nbytes
+    assert peak_memory(numpy_color2sepia, image, 0.5) < 4 * image.nbytes
+
+    # larger images are filtered in blocks, so only the output image grows with the size
+    large_image = np.tile(image, (4, 4, 1))
+    assert peak_memory(numpy_color2gray, large_image) < 1.5 * large_image.nbytes
+    assert peak_memory(numpy_color2sepia, large_image, 0.5) < 1.5 * large_image.nbytes
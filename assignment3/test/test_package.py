@@ -6,11 +6,15 @@ These tests should pass after task 1,
 before you've done any implementation.
 """
 from pathlib import Path
+import subprocess
+import sys
 import pkg_resources
 
 import numpy as np
 import pytest
 
+import instapy
+
 test_dir = Path(__file__).absolute().parent
 
 
@@ -53,7 +57,7 @@ def test_dependencies(dep):
 )
 @pytest.mark.parametrize(
     "implementation",
-    ["python", "numpy", "numba"],
+    ["python", "numpy", "numba", "numba_parallel", "auto"],
 )
 def test_get_filter(filter_name, implementation):
     """Can we load our filter functions"""
@@ -62,6 +66,80 @@ def test_get_filter(filter_name, implementation):
     filter_function = instapy.get_filter(filter_name, implementation)
 
 
+def test_filter_registry(monkeypatch):
+    """Can we list the registered filters and implementations"""
+    import instapy  # noqa
+
+    assert instapy.list_filters() == ["color2gray", "color2sepia"]
+    implementations = instapy.list_implementations()
+    assert {"python", "numpy", "numba", "cython"} <= set(implementations)
+    available = instapy.list_implementations(available_only=True)
+    assert {"python", "numpy", "numba"} <= set(available)
+    assert set(available) <= set(implementations)
+
+    # resolved filters are cached
+    gray = instapy.get_filter("color2gray", "numpy")
+    assert instapy.get_filter("color2gray", "numpy") is gray
+
+    monkeypatch.setitem(
+        instapy._implementations, "missing", ("instapy.missing_filters", ())
+    )
+    assert not instapy.is_available("missing")
+    with pytest.raises(ImportError):
+        instapy.get_filter("color2gray", "missing")
+    with pytest.raises(ValueError):
+        instapy.get_filter("color2blue", "python")
+    with pytest.raises(ValueError):
+        instapy.get_filter("color2gray", "fortran")
+
+
+def test_registry_is_lazy():
+    """Listing available implementations does not import them"""
+    code = (
+        "import sys, instapy; "
+        "instapy.list_implementations(available_only=True); "
+        "assert 'numba' not in sys.modules; "
+        "assert 'instapy.numba_filters' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_auto_filter(monkeypatch, tmp_path, image, reference_gray):
+    """Does the auto implementation calibrate once and reuse its selection"""
+    import json
+    import instapy
+    from instapy import auto
+
+    cache_file = tmp_path.joinpath("auto.json")
+    monkeypatch.setenv("INSTAPY_AUTO_CACHE", str(cache_file))
+    monkeypatch.setattr(auto, "_selected", None)
+
+    gray = instapy.get_filter("color2gray", "auto")(image)
+    np.testing.assert_allclose(gray, reference_gray, atol=2)
+    selected = json.loads(cache_file.read_text())["filters"]["color2gray"]
+    assert selected[auto.size_class(image)] in auto.CANDIDATES
+
+    # a new run reads the selection from the cache file instead of calibrating again
+    monkeypatch.setattr(auto, "_selected", None)
+
+    def calibrate(filter, image):
+        raise AssertionError("calibrated twice")
+
+    monkeypatch.setattr(auto, "calibrate", calibrate)
+    instapy.get_filter("color2gray", "auto")(image)
+    assert auto.size_class(np.zeros((2000, 2000, 3), np.uint8)) == "large"
+
+    # only keyword arguments are passed on
+    with pytest.raises(TypeError):
+        instapy.get_filter("color2gray", "auto")(image, True)
+
+    # the tunable sepia filter works whichever implementation was selected
+    from instapy.numpy_filters import numpy_color2sepia
+
+    sepia = instapy.get_filter("color2sepia", "auto")(image, k=0.5)
+    np.testing.assert_array_equal(sepia, numpy_color2sepia(image, 0.5))
+
+
 def test_io():
     """Can we import and use our io utilities"""
     from instapy import io
@@ -71,3 +149,199 @@ def test_io():
     assert len(image.shape) == 3
     assert image.dtype == np.uint8
     assert image.shape[2] == 3
+
+
+def test_cli_batch(monkeypatch, tmp_path, capsys):
+    """Can we filter a directory of images in batch mode"""
+    from instapy import cli, io
+
+    images = tmp_path.joinpath("images")
+    images.mkdir()
+    for name in ("a", "b", "c"):
+        io.write_image(io.random_image(32, 24), images.joinpath(f"{name}.png"))
+    images.joinpath("notes.txt").write_text("not an image")
+    assert len(cli.find_images([str(images)])) == 3
+    assert cli.find_images([str(images.joinpath("[ab].png"))]) == [
+        str(images.joinpath("a.png")),
+        str(images.joinpath("b.png")),
+    ]
+
+    out_dir = tmp_path.joinpath("out")
+    cli.main([str(images), "-i", "numpy", "-g", "-se", "-od", str(out_dir), "-j", "2"])
+    assert sorted(path.name for path in out_dir.iterdir()) == [
+        f"{name}_{filter}.png" for name in "abc" for filter in ("gray", "sepia")
+    ]
+    assert "images/s" in capsys.readouterr().out
+
+    # the auto implementation is selected once, before the workers are started
+    from instapy import auto
+
+    selected = []
+
+    def select(filter, image):
+        selected.append(filter)
+        return "numpy"
+
+    monkeypatch.setattr(auto, "select", select)
+    auto_dir = tmp_path.joinpath("auto")
+    cli.run_batch(
+        [str(images.joinpath("a.png")), str(images.joinpath("b.png"))],
+        str(auto_dir),
+        "auto",
+        filters=("color2gray", "color2sepia"),
+        jobs=2,
+    )
+    assert selected == ["color2gray", "color2sepia"]
+    assert len(list(auto_dir.iterdir())) == 4
+
+    # several files need an output directory
+    with pytest.raises(SystemExit):
+        cli.main([str(images.joinpath("a.png")), str(images.joinpath("b.png")), "-g"])
+
+    # images with the same name in different directories would overwrite each other
+    other_images = tmp_path.joinpath("other")
+    other_images.mkdir()
+    io.write_image(io.random_image(32, 24), other_images.joinpath("a.png"))
+    with pytest.raises(SystemExit):
+        cli.main([str(images), str(other_images), "-g", "-od", str(out_dir)])
+    with pytest.raises(ValueError):
+        files = [str(images.joinpath("a.png")), str(other_images.joinpath("a.png"))]
+        cli.run_batch(files, str(out_dir))
+
+    # options of a single file, and negative jobs, are rejected before any work starts
+    rejected_dir = tmp_path.joinpath("rejected")
+    for arguments in (["-o", "x.png"], ["-r"], ["-j", "-1"]):
+        with pytest.raises(SystemExit):
+            cli.main([str(images), "-g", "-od", str(rejected_dir)] + arguments)
+    with pytest.raises(ValueError):
+        cli.run_batch([str(images.joinpath("a.png"))], str(rejected_dir), jobs=-1)
+    assert not rejected_dir.exists()
+
+    # patterns and directories without images are an error, not an empty batch
+    with pytest.raises(SystemExit):
+        cli.main([str(images.joinpath("*.gif")), "-g"])
+    with pytest.raises(SystemExit):
+        cli.main([str(tmp_path), "-g"])  # only holds directories
+
+
+def test_init_batch_worker(monkeypatch):
+    """Are the threads of the batch workers limited"""
+    import os
+
+    from instapy import cli
+
+    numba = pytest.importorskip("numba")
+
+    monkeypatch.setenv("OMP_NUM_THREADS", "")
+    monkeypatch.setenv("NUMBA_NUM_THREADS", "")
+    threads = numba.get_num_threads()
+    try:
+        cli._init_batch_worker(1)
+        assert numba.get_num_threads() == 1
+    finally:
+        numba.set_num_threads(threads)
+    assert os.environ["OMP_NUM_THREADS"] == "1"
+    assert os.environ["NUMBA_NUM_THREADS"] == "1"
+
+
+def test_cli_pipeline(monkeypatch, tmp_path):
+    """Do several filters read and downscale the image only once"""
+    from PIL import Image
+
+    from instapy import cli, io
+
+    image = io.random_image(64, 48)
+    reads = []
+
+    def read_image(filename):
+        reads.append(filename)
+        return image
+
+    monkeypatch.setattr(io, "read_image", read_image)
+    out_file = tmp_path.joinpath("out.png")
+    arguments = ["-i", "numpy", "-g", "-se", "-t", "0.5", "-sc", "2", "-r"]
+    cli.main(["in.png", "-o", str(out_file)] + arguments)
+    assert reads == ["in.png"]
+    for filter in ("gray", "sepia"):
+        with Image.open(tmp_path.joinpath(f"out_{filter}.png")) as filtered:
+            assert filtered.size == (32, 24)
+
+
+@pytest.mark.parametrize(
+    "implementation",
+    ["python", "numpy", "numba", "numba_parallel", "cython"],
+)
+def test_single_channel(implementation, image):
+    """Can we get grayscale images with a single channel"""
+    import instapy
+
+    if not instapy.is_available(implementation):
+        pytest.skip(f"{implementation} is not available")
+    color2gray = instapy.get_filter("color2gray", implementation)
+    gray = color2gray(image, single_channel=True)
+    assert gray.shape == image.shape[:2]
+    assert gray.dtype == np.uint8
+    np.testing.assert_array_equal(gray, color2gray(image)[:, :, 0])
+
+
+@pytest.mark.parametrize("implementation", instapy.list_implementations())
+def test_out(implementation, monkeypatch, tmp_path, image):
+    """Can the filters write to a preallocated array or to the image itself"""
+    if not instapy.is_available(implementation):
+        pytest.skip(f"{implementation} is not available")
+    if implementation == "auto":
+        from instapy import auto
+
+        monkeypatch.setenv("INSTAPY_AUTO_CACHE", str(tmp_path.joinpath("auto.json")))
+        monkeypatch.setattr(auto, "_selected", None)
+    color2gray = instapy.get_filter("color2gray", implementation)
+    color2sepia = instapy.get_filter("color2sepia", implementation)
+
+    # filtering into a preallocated array gives the same result
+    image = image[:60, :80].copy()
+    expected_gray = color2gray(image)
+    expected_sepia = color2sepia(image)
+    gray_result = np.empty_like(image)
+    assert color2gray(image, out=gray_result) is gray_result
+    np.testing.assert_array_equal(gray_result, expected_gray)
+    gray_result = np.empty(image.shape[:2], dtype=np.uint8)
+    color2gray(image, single_channel=True, out=gray_result)
+    np.testing.assert_array_equal(gray_result, expected_gray[:, :, 0])
+    sepia_result = np.empty_like(image)
+    assert color2sepia(image, out=sepia_result) is sepia_result
+    np.testing.assert_array_equal(sepia_result, expected_sepia)
+
+    # an output overlapping the image does not overwrite pixels before they are read
+    flipped = image.copy()
+    color2sepia(flipped, out=flipped[::-1])
+    np.testing.assert_array_equal(flipped[::-1], expected_sepia)
+
+    # filtering in place overwrites the input image
+    sepia_result = image.copy()
+    assert color2sepia(sepia_result, inplace=True) is sepia_result
+    np.testing.assert_array_equal(sepia_result, expected_sepia)
+    assert color2gray(image, inplace=True) is image
+    np.testing.assert_array_equal(image, expected_gray)
+
+    with pytest.raises(ValueError):
+        color2gray(image, out=np.empty_like(image, dtype=float))
+    with pytest.raises(ValueError):
+        color2gray(image, single_channel=True, inplace=True)
+    # out, inplace and single_channel are keyword-only
+    with pytest.raises(TypeError):
+        color2gray(image, True)
+    with pytest.raises(TypeError):
+        color2sepia(image, 1, np.empty_like(image))
+
+
+def test_cli_single_channel(tmp_path):
+    """Are single channel grayscale images saved in L mode"""
+    from PIL import Image
+
+    from instapy import cli
+
+    out_file = tmp_path.joinpath("rain.png")
+    arguments = ["-i", "numpy", "-g", "-l", "-o", str(out_file)]
+    cli.main([str(test_dir.joinpath("rain.jpg"))] + arguments)
+    with Image.open(tmp_path.joinpath("rain_gray.png")) as gray:
+        assert gray.mode == "L"